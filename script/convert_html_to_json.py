@@ -9,17 +9,122 @@ This script:
 """
 
 import os
+import re
 import sys
 import json
 import time
 import argparse
 import logging
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+import functools
+import itertools
+import collections
+import concurrent.futures
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 
-import extruct
+import lxml.html
+from extruct.jsonld import JsonLdExtractor
+from extruct.w3cmicrodata import LxmlMicrodataExtractor
 from w3lib.html import get_base_url
 
+# orjson decodes/encodes in C and is ~2-5x faster than stdlib json on
+# typical JSON-LD payloads; fall back to the stdlib when it's not installed.
+try:
+    import orjson
+
+    def _loads(s):
+        return orjson.loads(s)
+
+    def _dumps(obj, compact: bool = True) -> bytes:
+        if compact:
+            return orjson.dumps(obj)
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(s):
+        return json.loads(s)
+
+    def _dumps(obj, compact: bool = True) -> bytes:
+        if compact:
+            return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# Output defaults to compact JSON (the files feed update_product_images.py,
+# not humans); --no-compact restores pretty-printing for debugging
+_compact_output = True
+
+# Compiled once at import time so batch runs don't rebuild the NFA per file.
+# Tolerates extra attributes on the <script> tag (id=, nonce=, whitespace
+# variants). The body group walks [^<] runs punctuated by '<' not followed
+# by /script>, which avoids the byte-by-byte retries a lazy .*? with DOTALL
+# would do on huge pages; re.ASCII keeps the classes off the Unicode tables.
+_SCRIPT_LD_RE = re.compile(
+    r'<script[^>]*type="application/ld\+json"[^>]*>'
+    r'([^<]*(?:<(?!/script>)[^<]*)*)</script>',
+    re.IGNORECASE | re.ASCII
+)
+
+# selectolax (Modest engine, C) finds the script nodes without regex
+# backtracking over large pages; fall back to the precompiled regex when
+# it is not installed.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+
+    def _ld_scripts(html: str) -> List[str]:
+        return [
+            node.text()
+            for node in _SelectolaxParser(html).css('script[type="application/ld+json"]')
+        ]
+except ImportError:
+    def _ld_scripts(html: str) -> List[str]:
+        return _SCRIPT_LD_RE.findall(html)
+
+# One alternation covers every @type we dispatch on, so list-valued @type
+# (e.g. ['Product', 'Thing']) needs a single scan rather than one pass per
+# candidate type.
+_TYPE_RE = re.compile(r'^(Product|Person|Offer|ItemList)$')
+
+def _known_type(type_value) -> Optional[str]:
+    """Return the first recognized @type, or None. Accepts str or list."""
+    if isinstance(type_value, str):
+        m = _TYPE_RE.match(type_value)
+        return m.group(1) if m else None
+    if isinstance(type_value, list):
+        return next(
+            (t for t in type_value if isinstance(t, str) and _TYPE_RE.match(t)),
+            None
+        )
+    return None
+
+# Reused for streaming decode of concatenated JSON-LD objects
+_JSON_DECODER = json.JSONDecoder()
+
+def _parse_jsonld_block(block: str) -> List[Any]:
+    """
+    Parse a script-tag body that may contain several whitespace-separated
+    JSON-LD objects.
+
+    The single-object fast path goes through _loads; only when that fails do
+    we walk the string with raw_decode, advancing past whitespace between
+    objects.
+    """
+    try:
+        return [_loads(block)]
+    except ValueError:
+        pass
+
+    objs = []
+    idx = 0
+    n = len(block)
+    while idx < n and block[idx].isspace():
+        idx += 1
+    while idx < n:
+        obj, end = _JSON_DECODER.raw_decode(block, idx)
+        objs.append(obj)
+        idx = end
+        while idx < n and block[idx].isspace():
+            idx += 1
+    return objs
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,151 +135,185 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def extract_json_ld(html: str, url: str) -> List[Dict]:
+# Directory for cached extraction results, keyed by HTML content hash
+CACHE_DIR = '.cache'
+
+def extract_json_ld(html: str, url: str, tree=None) -> List[Dict]:
     """
     Extract JSON-LD data from HTML, with enhanced support for script tags.
-    
-    This function first uses extruct library, then falls back to direct script tag
-    parsing if no ItemList is found in the extruct results.
+
+    Most willhaben pages embed the ItemList directly in a script tag, so the
+    cheap regex scan runs first; extruct's JSON-LD extractor (which needs a
+    full lxml parse) is only invoked when that scan finds no usable ItemList.
     """
-    import re
-    import json
-    
-    # First try using extruct
-    base_url = get_base_url(html, url)
-    data = extruct.extract(html, base_url=base_url, syntaxes=['json-ld'])
-    json_ld_data = data.get('json-ld', [])
-    
-    # Check if we already found an ItemList
-    for item in json_ld_data:
-        if isinstance(item, dict) and item.get('@type') == 'ItemList':
-            logger.debug("Found ItemList using extruct")
-            return json_ld_data
-            
-    # If we didn't find an ItemList, manually parse script tags
-    logger.debug("No ItemList found with extruct, attempting manual script tag parsing")
-    script_pattern = re.compile(r'<script\s+type="application/ld\+json">(.*?)</script>', re.DOTALL)
-    matches = script_pattern.findall(html)
-    
+    # Fast path: scan script tags directly with the precompiled regex
     manual_json_ld = []
-    for match in matches:
+    for match in _ld_scripts(html):
         try:
-            # Parse the JSON content
-            json_content = json.loads(match.strip())
-            
+            # A tag may hold one object or several concatenated ones
+            json_contents = _parse_jsonld_block(match)
+        except ValueError as e:
+            logger.warning(f"Failed to parse JSON-LD from script tag: {e}")
+            continue
+
+        for json_content in json_contents:
+            manual_json_ld.append(json_content)
+
             # Check if this is the ItemList we're looking for
-            if isinstance(json_content, dict) and json_content.get('@type') == 'ItemList':
+            if (isinstance(json_content, dict) and
+                    _known_type(json_content.get('@type')) == 'ItemList' and
+                    json_content.get('itemListElement')):
                 logger.info("Found ItemList in script tag")
-                manual_json_ld.append(json_content)
                 # We can return immediately since we found what we need
                 return manual_json_ld
-            else:
-                manual_json_ld.append(json_content)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse JSON-LD from script tag: {e}")
-    
-    # If we found any JSON-LD data manually, return it
+
+    # No ItemList via script tags - fall back to extruct
+    logger.debug("No ItemList found in script tags, falling back to extruct")
+    if tree is None:
+        tree = lxml.html.fromstring(html)
+    json_ld_data = JsonLdExtractor().extract_items(tree, base_url=url)
+
+    for item in json_ld_data:
+        if isinstance(item, dict) and item.get('@type') == 'ItemList':
+            logger.debug("Found ItemList using extruct")
+            return json_ld_data
+
+    # If we found any JSON-LD data manually, prefer it
     if manual_json_ld:
         logger.info(f"Found {len(manual_json_ld)} JSON-LD blocks in script tags")
         return manual_json_ld
-        
+
     # Otherwise, return whatever extruct found (which might be empty)
     return json_ld_data
 
-def extract_microdata(html: str, url: str) -> List[Dict]:
-    """Extract microdata from HTML."""
-    base_url = get_base_url(html, url)
-    data = extruct.extract(html, base_url=base_url, syntaxes=['microdata'])
-    return data.get('microdata', [])
+def extract_microdata(tree, url: str) -> List[Dict]:
+    """Extract microdata from a parsed HTML tree."""
+    return LxmlMicrodataExtractor().extract_items(tree, url)
+
+def _itemlist_has_products(data: List[Dict]) -> bool:
+    """Check whether the data holds an ItemList with at least one Product."""
+    for item in data:
+        if not isinstance(item, dict) or _known_type(item.get('@type')) != 'ItemList':
+            continue
+        elements = item.get('itemListElement', [])
+        if isinstance(elements, list):
+            for element in elements:
+                if (isinstance(element, dict) and
+                        element.get('@type') == 'ListItem' and
+                        isinstance(element.get('item'), dict) and
+                        element.get('item', {}).get('@type') == 'Product'):
+                    return True
+    return False
+
+def _handle_product(item: Dict, product_list: List[Dict], source_file: str) -> None:
+    """Append a standalone Product."""
+    logger.debug(f"Found standalone Product: {item.get('name', 'unknown')}")
+    product_list.append({
+        'item': item,
+        '@type': 'ListItem'
+    })
+
+def _handle_person(item: Dict, product_list: List[Dict], source_file: str) -> None:
+    """Build products from a Person's offers."""
+    if 'offers' not in item:
+        return
+    logger.debug(f"Found Person with offers: {item.get('name', 'unknown')}")
+    offers = item.get('offers', [])
+    if isinstance(offers, list):
+        for offer in offers:
+            if isinstance(offer, dict) and offer.get('@type') == 'Offer':
+                # Create a product from offer
+                product = {
+                    '@type': 'Product',
+                    'name': offer.get('name', f'Offer from {item.get("name", "unknown")}'),
+                    'description': offer.get('description', ''),
+                    'offers': offer
+                }
+                if 'image' in offer:
+                    product['image'] = offer['image']
+                product_list.append({
+                    'item': product,
+                    '@type': 'ListItem'
+                })
+
+def _handle_offer(item: Dict, product_list: List[Dict], source_file: str) -> None:
+    """Build a product from a standalone Offer."""
+    logger.debug(f"Found standalone Offer")
+    product = {
+        '@type': 'Product',
+        'name': item.get('name', f'Offer from {source_file}'),
+        'description': item.get('description', ''),
+        'offers': item
+    }
+    if 'image' in item:
+        product['image'] = item['image']
+    product_list.append({
+        'item': product,
+        '@type': 'ListItem'
+    })
+
+def _handle_generic(item: Dict, product_list: List[Dict], source_file: str) -> None:
+    """Look for products nested under common container keys."""
+    for key in ('product', 'item', 'offers'):
+        value = item.get(key)
+        if isinstance(value, dict) and value.get('@type') == 'Product':
+            logger.debug(f"Found Product in {key} property")
+            product_list.append({
+                'item': value,
+                '@type': 'ListItem'
+            })
+
+# Dispatch table built once: one dict lookup per item instead of a Python
+# branch cascade re-testing @type against each known value
+_TYPE_HANDLERS = {
+    'Product': _handle_product,
+    'Person': _handle_person,
+    'Offer': _handle_offer,
+}
 
-def convert_to_compatible_format(data: List[Dict], source_file: str) -> List[Dict]:
+def convert_to_compatible_format(data: Iterable[Dict], source_file: str) -> List[Dict]:
     """
     Convert extracted data to a format compatible with update_product_images.py.
     Preserves existing ItemList structures if found.
+
+    Accepts any iterable; a usable ItemList triggers an early return without
+    pulling the rest of the input (so chained microdata is never consumed).
     """
-    # First, check if we already have an ItemList with product data
+    # Bucket dicts by @type in a single lazy pass, returning as soon as an
+    # ItemList with product data shows up
+    by_type = collections.defaultdict(list)
     for item in data:
-        if isinstance(item, dict) and item.get('@type') == 'ItemList':
+        if not isinstance(item, dict):
+            continue
+        item_type = _known_type(item.get('@type'))
+        if item_type == 'ItemList':
             # Check if this ItemList has valid products
             item_list_elements = item.get('itemListElement', [])
             if item_list_elements and isinstance(item_list_elements, list):
-                # Check if elements have product data
-                has_valid_products = False
                 for element in item_list_elements:
-                    if (isinstance(element, dict) and 
+                    if (isinstance(element, dict) and
                         element.get('@type') == 'ListItem' and
                         isinstance(element.get('item'), dict) and
                         element.get('item', {}).get('@type') == 'Product'):
-                        # Found at least one valid product
-                        has_valid_products = True
-                        break
-                
-                if has_valid_products:
-                    logger.info(f"Found existing ItemList with {len(item_list_elements)} products")
-                    # Return the ItemList as-is
-                    return [item]
-    
+                        logger.info(f"Found existing ItemList with {len(item_list_elements)} products")
+                        # Return the ItemList as-is
+                        return [item]
+            continue
+        by_type[item_type or ''].append(item)
+
     # If we get here, we need to construct a product list
     product_list = []
-    
-    # Look for individual products
-    for item in data:
-        # Check for direct products
-        if isinstance(item, dict) and item.get('@type') == 'Product':
-            logger.debug(f"Found standalone Product: {item.get('name', 'unknown')}")
-            product_list.append({
-                'item': item,
-                '@type': 'ListItem'
-            })
-        # Check for other structures that might contain product data
-        elif isinstance(item, dict):
-            # Handle Person objects with products
-            if item.get('@type') == 'Person' and 'offers' in item:
-                logger.debug(f"Found Person with offers: {item.get('name', 'unknown')}")
-                offers = item.get('offers', [])
-                if isinstance(offers, list):
-                    for offer in offers:
-                        if isinstance(offer, dict) and offer.get('@type') == 'Offer':
-                            # Create a product from offer
-                            product = {
-                                '@type': 'Product',
-                                'name': offer.get('name', f'Offer from {item.get("name", "unknown")}'),
-                                'description': offer.get('description', ''),
-                                'offers': offer
-                            }
-                            if 'image' in offer:
-                                product['image'] = offer['image']
-                            product_list.append({
-                                'item': product,
-                                '@type': 'ListItem'
-                            })
-            
-            # Handle direct offer objects
-            elif item.get('@type') == 'Offer':
-                logger.debug(f"Found standalone Offer")
-                # Create a product from the offer
-                product = {
-                    '@type': 'Product',
-                    'name': item.get('name', f'Offer from {source_file}'),
-                    'description': item.get('description', ''),
-                    'offers': item
-                }
-                if 'image' in item:
-                    product['image'] = item['image']
-                product_list.append({
-                    'item': product,
-                    '@type': 'ListItem'
-                })
-            
-            # Try to find products in any other object types
-            elif any(key in item for key in ['product', 'item', 'offers']):
-                for key in ['product', 'item', 'offers']:
-                    if key in item and isinstance(item[key], dict) and item[key].get('@type') == 'Product':
-                        logger.debug(f"Found Product in {key} property")
-                        product_list.append({
-                            'item': item[key],
-                            '@type': 'ListItem'
-                        })
+
+    # Run the dedicated handlers over their buckets, then sweep whatever is
+    # left through the generic container-key probe
+    for type_name in ('Product', 'Person', 'Offer'):
+        handler = _TYPE_HANDLERS[type_name]
+        for item in by_type.pop(type_name, ()):
+            handler(item, product_list, source_file)
+
+    for remaining in by_type.values():
+        for item in remaining:
+            _handle_generic(item, product_list, source_file)
 
     # If no products found, create placeholder
     if not product_list:
@@ -196,56 +335,106 @@ def convert_to_compatible_format(data: List[Dict], source_file: str) -> List[Dic
         'itemListElement': product_list
     }]
 
+@functools.lru_cache(maxsize=1024)
+def _extract_compatible_data(path_key: Tuple[str, int, int]) -> List[Dict]:
+    """
+    Read, extract and convert one HTML file, memoized on
+    (realpath, mtime_ns, size).
+
+    Duplicate CLI args, symlinks to the same file and repeated calls within
+    a run all hit the in-process cache; the key invalidates automatically
+    when the file changes.
+    """
+    html_file = path_key[0]
+
+    # Read the HTML file in binary with a 256 KiB buffer (the 8 KiB
+    # default means ~size/8192 syscalls on multi-MB pages) and decode once
+    logger.info(f"Reading HTML file: {html_file}")
+    with open(html_file, 'rb', buffering=262144) as f:
+        raw_html = f.read()
+
+    # Check the on-disk cache first, keyed by content hash, so re-runs
+    # over the same corpus skip extraction entirely (blake2b is ~3x
+    # faster than md5 on CPython)
+    cache_key = hashlib.blake2b(raw_html, digest_size=16).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{cache_key}.json")
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = _loads(f.read())
+            logger.info(f"Using cached extraction results for {html_file}")
+            return cached
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {cache_path}: {e}")
+
+    html_content = raw_html.decode('utf-8')
+
+    # Parse the HTML once and share the tree between both extractors
+    logger.info("Extracting structured data")
+    tree = lxml.html.fromstring(html_content)
+    # get_base_url re-tokenizes the HTML hunting for a <base> tag;
+    # scraped pages almost never carry one, so probe cheaply first
+    # and otherwise use the file:// URL directly
+    file_url = "file://" + os.path.abspath(html_file)
+    if '<base ' in html_content:
+        base_url = get_base_url(html_content, file_url)
+    else:
+        base_url = file_url
+    json_ld_data = extract_json_ld(html_content, base_url, tree=tree)
+
+    # The converter discards microdata whenever JSON-LD already carries a
+    # usable ItemList, so don't pay for the microdata pass in that case
+    if _itemlist_has_products(json_ld_data):
+        microdata = []
+    else:
+        microdata = extract_microdata(tree, base_url)
+
+    # Chain the two result lists instead of concatenating them; the
+    # converter stops consuming as soon as it hits a usable ItemList and
+    # synthesizes a placeholder itself when nothing is found
+    compatible_data = convert_to_compatible_format(
+        itertools.chain(json_ld_data, microdata), html_file
+    )
+
+    # Populate the cache for the next run
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            f.write(_dumps(compatible_data))
+    except OSError as e:
+        logger.warning(f"Could not write cache entry {cache_path}: {e}")
+
+    return compatible_data
+
 def process_html_file(html_file: str, output_file: Optional[str] = None) -> str:
     """
     Process an HTML file and convert it to JSON.
-    
+
     Args:
         html_file: Path to the HTML file
         output_file: Optional path for the output file
-        
+
     Returns:
         Path to the generated JSON file
     """
     try:
-        # Read the HTML file
-        logger.info(f"Reading HTML file: {html_file}")
-        with open(html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-            
-        # Extract structured data
-        logger.info("Extracting structured data")
-        json_ld_data = extract_json_ld(html_content, "file://" + os.path.abspath(html_file))
-        microdata = extract_microdata(html_content, "file://" + os.path.abspath(html_file))
-        
-        # Combine data
-        all_data = json_ld_data + microdata
-        
-        if not all_data:
-            logger.warning(f"No structured data found in {html_file}")
-            # Create minimal data
-            all_data = [{
-                '@type': 'Product',
-                'name': f'Product from {html_file}',
-                'description': 'Auto-generated product',
-                'url': f'https://example.com/product-{int(time.time())}'
-            }]
-        
-        # Convert to compatible format
-        compatible_data = convert_to_compatible_format(all_data, html_file)
-        
+        st = os.stat(html_file)
+        compatible_data = _extract_compatible_data(
+            (os.path.realpath(html_file), st.st_mtime_ns, st.st_size)
+        )
+
         # Generate output filename if not provided
         if not output_file:
-            # Create a hash of the input filename
-            file_hash = hashlib.md5(html_file.encode()).hexdigest()
-            # Use the first 8 characters of the hash
-            file_prefix = file_hash[:8]
+            # Tag the output with an 8-hex-digit hash of the input filename;
+            # blake2b with a 4-byte digest is faster than md5 for short
+            # inputs and skips the OpenSSL hop
+            file_prefix = hashlib.blake2b(html_file.encode(), digest_size=4).hexdigest()
             output_file = f"{file_prefix}.json"
         
-        # Save to JSON file
+        # Save to JSON file as a single bytes write
         logger.info(f"Saving to {output_file}")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(compatible_data, f, indent=2)
+        with open(output_file, 'wb', buffering=262144) as f:
+            f.write(_dumps(compatible_data, compact=_compact_output))
             
         return output_file
         
@@ -253,32 +442,68 @@ def process_html_file(html_file: str, output_file: Optional[str] = None) -> str:
         logger.error(f"Error processing {html_file}: {e}")
         return None
 
+def _init_worker(compact: bool):
+    """Configure logging and output mode in pool worker processes."""
+    global _compact_output
+    _compact_output = compact
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
 def main():
     """Main function to process HTML files."""
     parser = argparse.ArgumentParser(description='Convert HTML files to JSON format')
-    
+
     parser.add_argument('html_files', nargs='+', help='HTML files to process')
     parser.add_argument('--output', '-o', help='Output file (default: auto-generated)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(),
+                        help='Number of parallel worker processes (default: CPU count)')
+    parser.add_argument('--compact', action=argparse.BooleanOptionalAction, default=True,
+                        help='Write compact JSON output (default; --no-compact pretty-prints)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
-    
+
     args = parser.parse_args()
-    
+
     if args.verbose:
         logger.setLevel(logging.DEBUG)
-    
+
+    global _compact_output
+    _compact_output = args.compact
+
     if len(args.html_files) > 1 and args.output:
         logger.warning("Output file specified with multiple input files - will be ignored")
         args.output = None
-    
-    processed_files = []
+
+    existing_files = []
     for html_file in args.html_files:
         if os.path.exists(html_file):
-            output = process_html_file(html_file, args.output if len(args.html_files) == 1 else None)
-            if output:
-                processed_files.append(output)
+            existing_files.append(html_file)
         else:
             logger.error(f"File not found: {html_file}")
-    
+
+    processed_files = []
+    if len(existing_files) > 1 and args.jobs and args.jobs > 1:
+        # Each file is independent (own input, own output), so extraction
+        # parallelizes across processes; extruct+lxml are the CPU bottleneck
+        logger.info(f"Processing {len(existing_files)} files with {args.jobs} workers")
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=args.jobs,
+            initializer=_init_worker,
+            initargs=(args.compact,)
+        ) as executor:
+            for output in executor.map(process_html_file, existing_files):
+                if output:
+                    processed_files.append(output)
+    else:
+        for html_file in existing_files:
+            output = process_html_file(html_file, args.output if len(existing_files) == 1 else None)
+            if output:
+                processed_files.append(output)
+
     if processed_files:
         logger.info(f"Successfully processed {len(processed_files)} files:")
         for file in processed_files:
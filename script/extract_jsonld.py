@@ -1,25 +1,62 @@
 #!/usr/bin/env python3
 import json
-import re
+import mmap
 from pathlib import Path
 
+# Use orjson's C decoder/encoder when available (2-5x faster on JSON-LD)
+try:
+    import orjson
+
+    def _loads(s):
+        return orjson.loads(s)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(s):
+        return json.loads(s)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Generator yielding raw JSON-LD script bodies from an HTML byte buffer.
+# bytes.find is a C-level substring search, so this never scans past the
+# last script tag nor materializes a full regex match list. Anchoring on
+# <script (not the bare MIME string, which can appear in page text) and
+# checking the tag's attributes keeps stray mentions from eating blocks.
+def iter_jsonld_blocks(buf):
+    pos = 0
+    while (i := buf.find(b'<script', pos)) != -1:
+        gt = buf.find(b'>', i)
+        if gt == -1:
+            break
+        if b'application/ld+json' not in buf[i:gt]:
+            pos = gt + 1
+            continue
+        end = buf.find(b'</script>', gt)
+        if end == -1:
+            break
+        yield buf[gt + 1:end]
+        pos = end + len(b'</script>')
+
 # Function to extract JSON-LD objects from HTML file
 def extract_jsonld(html_file):
-    html_content = html_file.read_text(encoding='utf-8')
-    
-    # Find all JSON-LD script tags using regex
-    pattern = r'<script type="application/ld\+json">\s*(.*?)\s*</script>'
-    matches = re.findall(pattern, html_content, re.DOTALL)
-    
-    # Parse each JSON-LD object and add to result array
+    if html_file.stat().st_size == 0:
+        return []
+
+    # Memory-map the file so the kernel pages bytes in on demand instead of
+    # allocating a full decoded copy of the HTML up front
     result = []
-    for json_str in matches:
-        try:
-            json_obj = json.loads(json_str)
-            result.append(json_obj)
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON-LD: {e}")
-    
+    with open(html_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Parse each JSON-LD object and add to result array
+            for json_bytes in iter_jsonld_blocks(mm):
+                try:
+                    json_obj = _loads(json_bytes)
+                    result.append(json_obj)
+                except ValueError as e:
+                    print(f"Error parsing JSON-LD: {e}")
+
     return result
 
 # Main execution
@@ -31,9 +68,8 @@ def main():
     # Extract JSON-LD objects
     jsonld_objects = extract_jsonld(input_file)
     
-    # Write to output file with pretty formatting
-    with output_file.open('w', encoding='utf-8') as f:
-        json.dump(jsonld_objects, f, indent=2, ensure_ascii=False)
+    # Write to output file with pretty formatting in one bytes write
+    output_file.write_bytes(_dumps(jsonld_objects))
     
     print(f"Successfully extracted {len(jsonld_objects)} JSON-LD objects to {output_file}")
 
@@ -12,18 +12,26 @@ This script:
 import json
 import os
 import asyncio
+import atexit
+import concurrent.futures
+import heapq
 import logging
+import signal
 import sys
 import random
 import time
 import hashlib
+import itertools
+import mmap
 import pathlib
+import pickle
 import json
-import uuid
 import socket
+import ssl
 import re
-import urllib.parse
+import email.utils
 import argparse
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple, Union, Set
 
@@ -32,6 +40,82 @@ from aiohttp import ClientError
 import extruct
 from w3lib.html import get_base_url
 
+# asyncio.wait_for wraps its awaitable in a fresh Task on every call; the
+# timeout context managers just arm a timer on the current task, which is
+# much cheaper in the worker hot loop.
+if sys.version_info >= (3, 11):
+    _timeout = asyncio.timeout
+else:
+    # async_timeout ships as an aiohttp dependency on older interpreters
+    from async_timeout import timeout as _timeout
+
+
+class HardTimeoutError(Exception):
+    """The per-URL hard ceiling fired.
+
+    Distinct from asyncio.TimeoutError so callers can tell a hung
+    iteration apart from aiohttp's transport-level timeouts.
+    """
+
+
+def _timeout_expired(cm) -> bool:
+    """True when a timeout context's own deadline fired.
+
+    asyncio.Timeout exposes expired() as a method, async_timeout as a
+    property; normalize both.
+    """
+    expired = cm.expired
+    return expired() if callable(expired) else bool(expired)
+
+# The URL hash only names cache files, so a cryptographic digest buys
+# nothing. xxh3 is ~3-4x cheaper per call than md5 (no OpenSSL EVP
+# dispatch); blake2b is the stdlib fallback and still beats md5.
+try:
+    import xxhash
+
+    # intdigest returns a plain int, skipping the per-call hasher object
+    # and hexdigest string that the oneshot hexdigest API still allocates;
+    # the default arg binds the lookup once for bulk hashing loops.
+    def _hash_url(url: str, _h=xxhash.xxh3_64_intdigest) -> str:
+        return f"{_h(url):016x}"
+except ImportError:
+    def _hash_url(url: str) -> str:
+        return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+
+# orjson encodes/decodes in C and is ~5-10x faster than stdlib json on the
+# indented path; fall back to the stdlib when it's not installed.
+try:
+    import orjson
+
+    def _json_loads(s):
+        return orjson.loads(s)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _json_dumps_line(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_dumps_state(obj) -> bytes:
+        return orjson.dumps(obj, default=list, option=orjson.OPT_APPEND_NEWLINE)
+
+    _HAS_ORJSON = True
+except ImportError:
+    def _json_loads(s):
+        return json.loads(s)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _json_dumps_line(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def _json_dumps_state(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                          default=list).encode('utf-8') + b'\n'
+
+    _HAS_ORJSON = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,11 +130,28 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 # Constants
-EXCLUDED_FILES = ['__example-page-data.qwad.json']
+EXCLUDED_FILES = frozenset({'__example-page-data.qwad.json'})
+# Session/worker IDs are only log tags; a process-local counter avoids
+# the os.urandom syscall and RFC 4122 formatting behind uuid.uuid4()
+_session_counter = itertools.count(1)
+
+
+def _next_session_id() -> str:
+    return f"s{next(_session_counter):08x}"
+
+
 CACHE_DIR = '.cache'
+# Created once at import; get_cache_path runs per URL and shouldn't pay
+# a mkdir syscall each time
+os.makedirs(CACHE_DIR, exist_ok=True)
 SKU_DATA_DIR = '.'  # Directory to store individual SKU JSON-LD data
 SKU_FILE_PREFIX = 'sku-'  # Prefix for SKU JSON files
+SKU_NDJSON_FILE = 'sku-data.ndjson'  # Rolling one-record-per-line crawl log
 STATE_FILE = '.wh_scraper_state.json'  # File to store progress state
+# Snapshots of the parsed CLI flags; set once in __main__ so hot loops
+# read plain module globals instead of probing args with try/NameError
+RESUME_MODE = False
+VERBOSE_MODE = False
 USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
@@ -64,10 +165,45 @@ USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/119.0',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36'
 ]
+def _accept_encoding() -> str:
+    """Build the Accept-Encoding value from the codecs we can decode.
+
+    zstd and brotli compress willhaben HTML 10-30% tighter than gzip and
+    decode faster; aiohttp auto-decompresses them in C when the codec
+    library is importable. Only advertise what we can actually inflate,
+    which for zstd also depends on the running aiohttp version.
+    """
+    codecs = []
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        # aiohttp only decodes zstd bodies transparently from 3.11 on;
+        # advertising it on older versions would hand extraction raw
+        # compressed bytes for every zstd response
+        version = tuple(int(p) for p in aiohttp.__version__.split('.')[:2] if p.isdigit())
+        if version >= (3, 11):
+            codecs.append('zstd')
+    try:
+        import brotli  # noqa: F401
+        codecs.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            codecs.append('br')
+        except ImportError:
+            pass
+    codecs.extend(['gzip', 'deflate'])
+    return ', '.join(codecs)
+
+
+ACCEPT_ENCODING = _accept_encoding()
+
 COMMON_HEADERS = {
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
     'Accept-Language': 'en-US,en;q=0.9,de;q=0.8',
-    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Encoding': ACCEPT_ENCODING,
     'Connection': 'keep-alive',
     'Cache-Control': 'max-age=0',
     'Sec-Fetch-Dest': 'document',
@@ -78,16 +214,30 @@ COMMON_HEADERS = {
     'Referer': 'https://www.willhaben.at/iad/kaufen-und-verkaufen/verkaeuferprofil/',
     'DNT': '1'
 }
-MAX_CONCURRENT_REQUESTS = 1
+MAX_CONCURRENT_REQUESTS = 4
 REQUEST_TIMEOUT = 60  # seconds
+# Hard ceiling over the bounded phases of one URL: the fetch attempts
+# and the parse/save work. Rate-limit waits are excluded — under
+# concurrency a queued reservation legitimately waits several periods,
+# which is not a hang. An extreme run of 403 cooldowns can still trip
+# this; such URLs get one retry and are then dropped.
+PROCESS_URL_HARD_TIMEOUT = 3600  # seconds
 MAX_RETRIES = 5
 BASE_RETRY_DELAY = 300  # seconds (5 minutes)
+# Precomputed per-attempt retry delays (seconds); jitter is applied at
+# sleep time. The old BASE_RETRY_DELAY * 2**attempt math hit its 120s
+# cap on the very first attempt anyway, so the schedule ramps up to the
+# cap instead of computing it
+_BACKOFF_SCHEDULE = (30.0, 60.0, 120.0, 120.0, 120.0)
 MIN_REQUEST_DELAY = 120  # seconds (2 minutes)
 MAX_REQUEST_DELAY = 300  # seconds (5 minutes)
 CACHE_EXPIRY = 86400 * 7  # 7 days in seconds
+RECENT_SKU_THRESHOLD_SEC = 86400 * 7  # SKU files younger than this are trusted as-is
 SESSION_RATE_LIMIT = 0.02  # requests per SESSION_RATE_PERIOD (1 per 50 minutes)
 SESSION_RATE_PERIOD = 3000  # seconds (50 minutes)
-MAX_QUEUE_SIZE = 100  # maximum number of queued requests
+# Small bound: the producer blocks in put_many once workers fall behind,
+# so a whole file's URLs are never buffered inside the queue at once
+MAX_QUEUE_SIZE = 2 * MAX_CONCURRENT_REQUESTS
 PROXY_CHECK_TIMEOUT = 10  # seconds
 PROXY_ROTATION_THRESHOLD = 3  # failures before rotating proxy
 SESSION_RECOVERY_DELAY = 30 * 60  # 30 minutes before trying again after severe rate limiting
@@ -97,13 +247,23 @@ PROXIES = [
     # Add your proxies here
 ]  
 
+# Compiled once at module scope; re.search with a literal pattern pays a
+# cache lookup plus dispatch on every call otherwise
+_SKU_URL_RE = re.compile(r'/d/[^/]+-(\d+)/?')
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+_SKU_QUERY_RE = re.compile(r'[?&](?:sku|id)=([^&]+)')
+_LDJSON_RE = re.compile(
+    rb'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE
+)
+
 # Browser fingerprinting data
 BROWSER_FINGERPRINTS = [
     {
         "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
         "accept_language": "en-US,en;q=0.9,de;q=0.8",
-        "accept_encoding": "gzip, deflate, br",
+        "accept_encoding": ACCEPT_ENCODING,
         "sec_ch_ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
         "sec_ch_ua_platform": '"macOS"',
         "sec_ch_ua_mobile": "?0"
@@ -112,7 +272,7 @@ BROWSER_FINGERPRINTS = [
         "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
         "accept_language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
-        "accept_encoding": "gzip, deflate, br",
+        "accept_encoding": ACCEPT_ENCODING,
         "sec_ch_ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
         "sec_ch_ua_platform": '"Windows"',
         "sec_ch_ua_mobile": "?0"
@@ -121,7 +281,7 @@ BROWSER_FINGERPRINTS = [
         "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/119.0",
         "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
         "accept_language": "de,en-US;q=0.7,en;q=0.3",
-        "accept_encoding": "gzip, deflate, br",
+        "accept_encoding": ACCEPT_ENCODING,
         "sec_fetch_dest": "document",
         "sec_fetch_mode": "navigate",
         "sec_fetch_site": "none",
@@ -129,58 +289,110 @@ BROWSER_FINGERPRINTS = [
     }
 ]
 
-def get_cache_path(url: str) -> pathlib.Path:
+def get_cache_path(url: str) -> str:
     """Generate a cache file path for a URL."""
-    # Create cache directory if it doesn't exist
-    cache_dir = pathlib.Path(CACHE_DIR)
-    cache_dir.mkdir(exist_ok=True)
-    
-    # Create a hash of the URL to use as the filename
-    url_hash = hashlib.md5(url.encode()).hexdigest()
-    return cache_dir / f"{url_hash}.html"
+    return os.path.join(CACHE_DIR, f"{_hash_url(url)}.html")
 
 
-def is_cache_valid(cache_path: pathlib.Path) -> bool:
-    """Check if cache file exists and is not expired."""
-    if not cache_path.exists():
-        return False
-    
-    # Check if the cache is too old
-    cache_age = time.time() - cache_path.stat().st_mtime
-    return cache_age < CACHE_EXPIRY
+def _response_expiry(headers) -> Optional[float]:
+    """Derive an absolute expiry epoch from Cache-Control/Expires headers."""
+    match = _MAX_AGE_RE.search(headers.get('Cache-Control', ''))
+    if match:
+        return time.time() + int(match.group(1))
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return email.utils.parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return None
 
 
-def read_cache(cache_path: pathlib.Path) -> Optional[str]:
-    """Read content from cache file."""
+def load_cache(cache_path: str) -> Optional[bytes]:
+    """
+    Return cached raw bytes if present and unexpired, or None.
+
+    New-format entries carry an absolute expiry epoch as a #expiry=
+    first line derived from the origin's caching headers; legacy
+    entries fall back to the fixed mtime-based CACHE_EXPIRY TTL. A hit
+    costs one open plus one read either way.
+    """
     try:
-        return cache_path.read_text(encoding="utf-8")
-    except Exception as e:
+        with open(cache_path, 'rb') as f:
+            first = f.readline()
+            if first.startswith(b'#expiry='):
+                try:
+                    expiry = int(first[8:])
+                except ValueError:
+                    return None
+                if time.time() >= expiry:
+                    return None
+                return f.read()
+            # Legacy entry without expiry header
+            if time.time() - os.fstat(f.fileno()).st_mtime >= CACHE_EXPIRY:
+                return None
+            return first + f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
         logger.warning(f"Error reading cache file {cache_path}: {e}")
         return None
 
 
-def write_cache(cache_path: pathlib.Path, content: str) -> bool:
-    """Write content to cache file."""
+def write_cache(cache_path: str, content: bytes,
+                expires_at: Optional[float] = None) -> bool:
+    """Write raw content bytes to cache file with an expiry header line."""
+    if expires_at is None:
+        expires_at = time.time() + CACHE_EXPIRY
     try:
-        cache_path.write_text(content, encoding="utf-8")
+        with open(cache_path, 'wb') as f:
+            f.write(b'#expiry=%d\n' % int(expires_at))
+            f.write(content)
         return True
     except Exception as e:
         logger.warning(f"Error writing to cache file {cache_path}: {e}")
         return False
 
 
+# Optional Bloom filter front-end for the processed-URL/SKU checks: a
+# definite "not seen" answer from the bitmap skips hashing into the big
+# authoritative sets on the fresh-crawl fast path.
+try:
+    from rbloom import Bloom
+except ImportError:
+    Bloom = None
+
+
+# Proxy bookkeeping ages out after an hour so large rotation pools don't
+# grow the per-proxy dicts without bound; plain dicts are the fallback
+# when cachetools isn't installed.
+try:
+    from cachetools import TTLCache
+
+    def _proxy_cache():
+        return TTLCache(maxsize=10_000, ttl=3600)
+except ImportError:
+    def _proxy_cache():
+        return {}
+
+
 class ProxyManager:
     """Manager for proxy rotation and health checking."""
     def __init__(self, proxies: List[str] = None):
         self.proxies = proxies or PROXIES
         self.available_proxies = self.proxies.copy() if self.proxies else []
-        self.failed_proxies: Dict[str, int] = {}  # proxy -> failure count
-        self.proxy_last_used: Dict[str, float] = {}  # proxy -> timestamp
+        self.failed_proxies = _proxy_cache()  # proxy -> failure count
+        self.proxy_last_used = _proxy_cache()  # proxy -> timestamp
         self.current_proxy: Optional[str] = None
+        # Min-heap of (last_used_ts, proxy): the top is always the LRU
+        # proxy, so selection is O(log N) instead of a linear scan under
+        # the lock. Entries for removed proxies are discarded lazily.
+        self._heap: List[Tuple[float, str]] = [(0.0, p) for p in self.available_proxies]
+        heapq.heapify(self._heap)
         self.lock = asyncio.Lock()
         
         # Generate a unique session ID
-        self.session_id = str(uuid.uuid4())[:8]
+        self.session_id = _next_session_id()
         logger.info(f"ProxyManager initialized with {len(self.available_proxies)} proxies")
     
     async def get_proxy(self) -> Optional[str]:
@@ -191,37 +403,34 @@ class ProxyManager:
                 self._recover_failed_proxies()
                 if not self.available_proxies:
                     return None
-            
-            # If we already have a current proxy that's working, keep using it
-            if self.current_proxy and self.current_proxy in self.available_proxies:
-                # Check if we've used this proxy recently
-                last_used = self.proxy_last_used.get(self.current_proxy, 0)
-                if time.time() - last_used > 60:  # Give 60s between uses of the same proxy
-                    self.proxy_last_used[self.current_proxy] = time.time()
-                    return self.current_proxy
-            
-            # Rotate to a new proxy
-            for proxy in self.available_proxies:
-                # Check if we've used this proxy recently
-                last_used = self.proxy_last_used.get(proxy, 0)
-                if time.time() - last_used > 60:  # Give 60s between uses of the same proxy
-                    self.current_proxy = proxy
-                    self.proxy_last_used[proxy] = time.time()
+
+            # Pop the least-recently-used proxy off the heap, skipping
+            # stale entries for proxies no longer in rotation. Monotonic
+            # clock: these are relative intervals, so wall-clock jumps
+            # must not distort them
+            now = time.monotonic()
+            available = set(self.available_proxies)
+            chosen = None
+            while self._heap:
+                last_used, proxy = heapq.heappop(self._heap)
+                if proxy not in available:
+                    continue
+                chosen = proxy
+                if now - last_used > 60:  # Give 60s between uses of the same proxy
                     logger.info(f"Rotating to proxy: {self._mask_proxy(proxy)}")
-                    return proxy
-            
-            # All proxies have been used recently, use the least recently used one
-            if self.available_proxies:
-                least_recent_proxy = min(
-                    self.available_proxies, 
-                    key=lambda p: self.proxy_last_used.get(p, 0)
-                )
-                self.current_proxy = least_recent_proxy
-                self.proxy_last_used[least_recent_proxy] = time.time()
-                logger.info(f"Using least recent proxy: {self._mask_proxy(least_recent_proxy)}")
-                return least_recent_proxy
-            
-            return None
+                else:
+                    # Everything has been used recently; the heap top is
+                    # still the least recent choice
+                    logger.info(f"Using least recent proxy: {self._mask_proxy(proxy)}")
+                break
+
+            if chosen is None:
+                return None
+
+            heapq.heappush(self._heap, (now, chosen))
+            self.proxy_last_used[chosen] = now
+            self.current_proxy = chosen
+            return chosen
     
     def _mask_proxy(self, proxy: str) -> str:
         """Mask proxy credentials for logging."""
@@ -288,6 +497,7 @@ class ProxyManager:
         for proxy, _ in failed_proxies:
             if proxy not in self.available_proxies and proxy in self.proxies:
                 self.available_proxies.append(proxy)
+                heapq.heappush(self._heap, (self.proxy_last_used.get(proxy, 0.0), proxy))
                 logger.info(f"Recovered proxy for use: {self._mask_proxy(proxy)}")
                 self.failed_proxies[proxy] = 0
                 
@@ -296,57 +506,68 @@ class ProxyManager:
                     break
 
 
+def _build_fingerprint_headers(fingerprint: Dict[str, str]) -> Dict[str, str]:
+    """Expand a BROWSER_FINGERPRINTS entry into a full header dict."""
+    headers = {
+        "User-Agent": fingerprint["user_agent"],
+        "Accept": fingerprint["accept"],
+        "Accept-Language": fingerprint["accept_language"],
+        "Accept-Encoding": fingerprint["accept_encoding"],
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "DNT": "1",
+    }
+
+    # Add browser-specific headers
+    if "sec_ch_ua" in fingerprint:
+        headers["sec-ch-ua"] = fingerprint["sec_ch_ua"]
+        headers["sec-ch-ua-platform"] = fingerprint["sec_ch_ua_platform"]
+        headers["sec-ch-ua-mobile"] = fingerprint["sec_ch_ua_mobile"]
+
+    if "sec_fetch_dest" in fingerprint:
+        headers["sec-fetch-dest"] = fingerprint["sec_fetch_dest"]
+        headers["sec-fetch-mode"] = fingerprint["sec_fetch_mode"]
+        headers["sec-fetch-site"] = fingerprint["sec_fetch_site"]
+        headers["sec-fetch-user"] = fingerprint["sec_fetch_user"]
+
+    return headers
+
+
+# Expanded once at import so get_headers only copies a dict and applies
+# the per-request randomized extras
+_FINGERPRINT_HEADERS = [_build_fingerprint_headers(fp) for fp in BROWSER_FINGERPRINTS]
+
+
 class BrowserSession:
     """Manages browser-like behavior and session state."""
     def __init__(self):
-        self.fingerprint = random.choice(BROWSER_FINGERPRINTS)
+        fp_index = random.randrange(len(BROWSER_FINGERPRINTS))
+        self.fingerprint = BROWSER_FINGERPRINTS[fp_index]
+        self._base_headers = _FINGERPRINT_HEADERS[fp_index]
         self.cookies = {}
-        self.session_id = str(uuid.uuid4())[:8]
+        self.session_id = _next_session_id()
         self.last_request_time = 0
-        self.visit_history = []
-        
-    def get_headers(self) -> Dict[str, str]:
+        # maxlen evicts old entries automatically, no slicing/copying
+        self.visit_history: deque = deque(maxlen=10)
+
+    def get_headers(self, _random=random.random, _choice=random.choice) -> Dict[str, str]:
         """Get browser-like headers."""
-        headers = {
-            "User-Agent": self.fingerprint["user_agent"],
-            "Accept": self.fingerprint["accept"],
-            "Accept-Language": self.fingerprint["accept_language"],
-            "Accept-Encoding": self.fingerprint["accept_encoding"],
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "DNT": "1",
-        }
-        
-        # Add browser-specific headers
-        if "sec_ch_ua" in self.fingerprint:
-            headers["sec-ch-ua"] = self.fingerprint["sec_ch_ua"]
-            headers["sec-ch-ua-platform"] = self.fingerprint["sec_ch_ua_platform"]
-            headers["sec-ch-ua-mobile"] = self.fingerprint["sec_ch_ua_mobile"]
-        
-        if "sec_fetch_dest" in self.fingerprint:
-            headers["sec-fetch-dest"] = self.fingerprint["sec_fetch_dest"]
-            headers["sec-fetch-mode"] = self.fingerprint["sec_fetch_mode"]
-            headers["sec-fetch-site"] = self.fingerprint["sec_fetch_site"]
-            headers["sec-fetch-user"] = self.fingerprint["sec_fetch_user"]
-        
+        headers = self._base_headers.copy()
+
         # Add common headers
-        if random.random() > 0.5:
-            headers["Cache-Control"] = random.choice(["max-age=0", "no-cache"])
-            
+        if _random() > 0.5:
+            headers["Cache-Control"] = _choice(["max-age=0", "no-cache"])
+
         # Add referrer if we have history
-        if self.visit_history and random.random() > 0.3:
-            headers["Referer"] = random.choice(self.visit_history)
-            
+        if self.visit_history and _random() > 0.3:
+            headers["Referer"] = _choice(self.visit_history)
+
         return headers
     
     def record_visit(self, url: str) -> None:
         """Record URL visit in history."""
         self.visit_history.append(url)
-        self.last_request_time = time.time()
-        
-        # Keep history limited to last 10 URLs
-        if len(self.visit_history) > 10:
-            self.visit_history = self.visit_history[-10:]
+        self.last_request_time = time.monotonic()
 
 
 def get_proxy_for_session(session: aiohttp.ClientSession) -> Optional[str]:
@@ -362,30 +583,60 @@ class RateLimiter:
     def __init__(self, rate_limit: int, period: int):
         self.rate_limit = rate_limit  # requests per period
         self.period = period  # in seconds
-        self.timestamps = []
-        self.lock = asyncio.Lock()
+        # Timestamps are appended in order, so expired ones are always at
+        # the front — popleft keeps pruning amortized O(1)
+        self.timestamps: deque = deque()
+
+    def next_available_at(self) -> float:
+        """
+        Reserve the next request slot and return the monotonic timestamp
+        at which it may be used.
+
+        Pure-sync bookkeeping: nothing awaits between the read and the
+        append, so no lock is needed on a single event loop, and a caller
+        with a free slot never touches the scheduler at all.
+        """
+        # Monotonic clock: immune to NTP/wall-clock jumps
+        now = time.monotonic()
+        timestamps = self.timestamps
+        while timestamps and now - timestamps[0] >= self.period:
+            timestamps.popleft()
+        if len(timestamps) >= self.rate_limit:
+            # Chain off the reservation whose expiry frees our slot (the
+            # rate_limit-th most recent), not the oldest one: concurrent
+            # callers each land a full period apart instead of bursting
+            # together off the same base. The random pad keeps the
+            # request cadence from looking robotic.
+            at = timestamps[-max(1, int(self.rate_limit))] + self.period + random.uniform(60, 120)
+            if at < timestamps[-1]:
+                # Keep the deque non-decreasing so popleft pruning stays valid
+                at = timestamps[-1]
+        else:
+            at = now
+        timestamps.append(at)
+        return at
+
+    def _release(self, at: float) -> None:
+        """Drop a reservation whose sleeper was cancelled before using it."""
+        try:
+            self.timestamps.remove(at)
+        except ValueError:
+            pass  # already pruned
 
     async def acquire(self):
         """Acquire permission to make a request, waiting if necessary."""
-        async with self.lock:
-            now = time.time()
-            
-            # Remove timestamps older than our period
-            self.timestamps = [ts for ts in self.timestamps if now - ts < self.period]
-            
-            # Wait if we've reached the limit
-            if len(self.timestamps) >= self.rate_limit:
-                oldest = min(self.timestamps)
-                wait_time = self.period - (now - oldest) + random.uniform(60, 120)  # Add extra 1-2 minutes
-                if wait_time > 0:
-                    logger.info(f"Rate limit reached, waiting {wait_time:.2f}s before next request...")
-                    await asyncio.sleep(wait_time)
-                    # Recalculate now
-                    now = time.time()
-                    self.timestamps = [ts for ts in self.timestamps if now - ts < self.period]
-            
-            # Add current timestamp
-            self.timestamps.append(now)
+        at = self.next_available_at()
+        delay = at - time.monotonic()
+        if delay > 0:
+            logger.info(f"Rate limit reached, waiting {delay:.2f}s before next request...")
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # Give the slot back: a cancelled waiter that kept its
+                # reservation would push every later caller out by a
+                # full period
+                self._release(at)
+                raise
 
 
 class RequestQueue:
@@ -434,6 +685,27 @@ class RequestQueue:
                 logger.debug(f"URL already in queue: {url}")
                 return False
     
+    async def put_many(self, items) -> int:
+        """
+        Enqueue many (url, product_ref[, filename]) tuples under a single
+        lock acquisition, skipping URLs that are already pending.
+
+        Returns:
+            int: The number of items actually added.
+        """
+        added = 0
+        async with self.lock:
+            pending = self.pending
+            for item in items:
+                url = item[0]
+                if url in pending:
+                    logger.debug(f"URL already in queue: {url}")
+                    continue
+                await self.queue.put(item)
+                pending.add(url)
+                added += 1
+        return added
+
     async def get(self, timeout=None):
         """
         Get an item from the queue.
@@ -448,7 +720,8 @@ class RequestQueue:
             asyncio.TimeoutError: If timeout is specified and no item is available within the timeout period
         """
         if timeout is not None:
-            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            async with _timeout(timeout):
+                return await self.queue.get()
         return await self.queue.get()
     
     def task_done(self, url: str):
@@ -472,139 +745,192 @@ class RequestQueue:
         return len(self.pending)
 
 
-async def fetch_url(session: Optional[aiohttp.ClientSession], url: str, retries: int = MAX_RETRIES) -> Optional[str]:
-    """Fetch a URL with retries and aggressive rate limiting."""
+# One long-lived session shared by every fetch: HTTP keep-alive, a pooled
+# connector and a single DNS cache instead of per-request session teardown.
+# Backpressure comes from the asyncio.Semaphore the callers already hold.
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+# Set each time the shared session is (re)built, so workers backing off
+# after request errors can resume as soon as the pool is fresh instead
+# of sleeping out their whole backoff
+_session_renewed = asyncio.Event()
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Return the shared ClientSession, creating it on first use."""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        # One connector for the lifetime of the session: DNS answers are
+        # cached across retries and TLS sessions can resume (1-RTT instead
+        # of a full handshake per attempt)
+        conn = aiohttp.TCPConnector(
+            ssl=ssl.create_default_context(),
+            limit=20,
+            limit_per_host=MAX_CONCURRENT_REQUESTS,
+            use_dns_cache=True,
+            ttl_dns_cache=600,  # Cache DNS results for 10 minutes
+            force_close=False,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        _shared_session = aiohttp.ClientSession(
+            connector=conn,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),  # Allow cookies from non-secure connections
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        )
+        _session_renewed.set()
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    """Close the shared session if it exists."""
+    global _shared_session
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
+
+async def fetch_url(
+    session: Optional[aiohttp.ClientSession],
+    url: str,
+    retries: int = MAX_RETRIES,
+    rate_limiter: Optional[RateLimiter] = None
+) -> Optional[bytes]:
+    """
+    Fetch a URL with retries and aggressive rate limiting.
+
+    Returns the raw response bytes; decoding is deferred to extraction so
+    the cache stays byte-for-byte identical to what came off the wire and
+    no chardet/encode round trip happens per fetch.
+    """
     # Check cache first
     cache_path = get_cache_path(url)
-    if is_cache_valid(cache_path):
+    cached_content = load_cache(cache_path)
+    if cached_content:
         logger.info(f"Using cached content for {url}")
-        cached_content = read_cache(cache_path)
-        if cached_content:
-            return cached_content
-    
-    # Add a human-like pause before making the request
-    human_delay = random.uniform(1, 5) + random.uniform(0, 2)
-    await asyncio.sleep(human_delay)
+        return cached_content
+
+    if rate_limiter is not None:
+        # Reserve the slot only now, after the page cache has missed:
+        # only requests that actually go over the wire spend slots
+        await rate_limiter.acquire()
+
+    # The hard ceiling only starts once a slot is held: it polices the
+    # bounded fetch work (attempts, backoffs, cooldowns), never the
+    # rate-limit wait
+    hard_cm = _timeout(PROCESS_URL_HARD_TIMEOUT)
+    try:
+        async with hard_cm:
+            # Add a human-like pause before making the request
+            human_delay = random.uniform(1, 5) + random.uniform(0, 2)
+            await asyncio.sleep(human_delay)
     
-    # Simulate "thinking time" and vary it based on URL complexity
-    thinking_time = len(url) % 5 + random.uniform(1, 3)
-    await asyncio.sleep(thinking_time)
+            # Simulate "thinking time" and vary it based on URL complexity
+            thinking_time = len(url) % 5 + random.uniform(1, 3)
+            await asyncio.sleep(thinking_time)
     
-    for attempt in range(retries):
-        # Calculate exponential backoff delay with jitter
-        backoff_delay = BASE_RETRY_DELAY * (2 ** attempt) + random.uniform(1, 5)
-        # Cap the delay at a reasonable maximum
-        backoff_delay = min(backoff_delay, 120)
-        
-        # Use a different user agent for each retry
-        user_agent = random.choice(USER_AGENTS)
-        headers = COMMON_HEADERS.copy()
-        headers['User-Agent'] = user_agent
-        
-        # Add some randomness to request headers to look more human-like
-        if random.random() > 0.5:
-            headers['Accept-Encoding'] = random.choice(['gzip, deflate', 'gzip, deflate, br'])
-        
-        # Sometimes include a different referer
-        if random.random() > 0.7:
-            headers['Referer'] = 'https://www.google.com/search?q=willhaben'
-        
-        # Flag to check if we need to create a new session
-        should_create_session = session is None
-        session_to_use = session
-        
-        try:
-            # Create a new session if needed for this request
-            if should_create_session:
-                conn = aiohttp.TCPConnector(
-                    ssl=False,
-                    ttl_dns_cache=300,  # Cache DNS results for 5 minutes
-                    enable_cleanup_closed=True
-                )
-                session_to_use = aiohttp.ClientSession(
-                    connector=conn,
-                    timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-                )
-                
-            # Get a proxy for this request if available
-            proxy = get_proxy_for_session(session_to_use)
-            
-            proxy_info = f" via proxy {proxy}" if proxy else ""
-            logger.info(f"Requesting {url}{proxy_info} with User-Agent: {user_agent[:30]}...")
-            
-            async with session_to_use.get(
-                url,
-                timeout=REQUEST_TIMEOUT,
-                headers=headers,
-                proxy=proxy
-            ) as response:
-                if response.status == 200:
-                    # Success! Get the content
-                    content = await response.text()
-                    # Cache the response
-                    if content and len(content) > 100:  # Only cache non-empty responses
-                        write_cache(cache_path, content)
-                    # Add a random delay before returning to avoid overwhelming the server
-                    await asyncio.sleep(random.uniform(MIN_REQUEST_DELAY, MAX_REQUEST_DELAY))
-                    # Close session if we created it
-                    if should_create_session and session_to_use is not None:
-                        await session_to_use.close()
-                    return content
-                elif response.status == 429:  # Too Many Requests
-                    logger.warning(f"Rate limited (429) for {url}, waiting longer before retry")
-                    # Use a much longer delay for rate limit errors
-                    wait_time = backoff_delay * 3 + random.uniform(300, 600)  # 5-10 minutes
-                    logger.warning(f"Rate limited (429). Implementing long cooldown of {wait_time:.2f}s for {url}")
-                    # Close session if we created it since we'll create a new one on retry
-                    if should_create_session and session_to_use is not None:
-                        await session_to_use.close()
-                        session_to_use = None
-                    await asyncio.sleep(wait_time)
-                    
-                    # After a rate limit, we should be extremely cautious
-                    if attempt < retries - 1:
-                        logger.info("After rate limit, adding additional cooldown period...")
-                        await asyncio.sleep(random.uniform(120, 240))  # Additional 2-4 minute cooldown
-                        
-                elif response.status == 403:  # Forbidden
-                    logger.warning(f"Received 403 Forbidden for {url}, may be blocked")
-                    # Even longer delay for this - potential IP ban/block
-                    wait_time = backoff_delay * 4 + random.uniform(600, 1200)  # 10-20 minutes
-                    logger.warning(f"Possible blocking detected. Implementing very long cooldown of {wait_time:.2f}s")
-                    # Close session if we created it since we'll create a new one on retry
-                    if should_create_session and session_to_use is not None:
-                        await session_to_use.close()
-                        session_to_use = None
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.warning(f"Failed to fetch {url}, status code: {response.status}")
-                    # Close session if we created it since we'll create a new one on retry
-                    if should_create_session and session_to_use is not None:
-                        await session_to_use.close()
-                        session_to_use = None
-        except (ClientError, asyncio.TimeoutError, aiohttp.ClientError) as e:
-            logger.warning(f"Error fetching {url} (attempt {attempt+1}/{retries}): {e}")
-            # Always close session on error if we created it
-            if should_create_session and session_to_use is not None:
+            last_exc: Optional[BaseException] = None
+            for attempt in range(retries):
+                # Cleared per attempt so only a transport failure on the final
+                # attempt propagates; an HTTP error response means the connection
+                # itself is fine
+                last_exc = None
+                # Look up the precomputed backoff and jitter it by +/-20%
+                backoff_delay = _BACKOFF_SCHEDULE[min(attempt, len(_BACKOFF_SCHEDULE) - 1)] \
+                    * (0.8 + random.random() * 0.4)
+
+
+                # Use a different user agent for each retry
+                user_agent = random.choice(USER_AGENTS)
+                headers = COMMON_HEADERS.copy()
+                headers['User-Agent'] = user_agent
+        
+                # Add some randomness to request headers to look more human-like
+                if random.random() > 0.5:
+                    headers['Accept-Encoding'] = random.choice(['gzip, deflate', ACCEPT_ENCODING])
+        
+                # Sometimes include a different referer
+                if random.random() > 0.7:
+                    headers['Referer'] = 'https://www.google.com/search?q=willhaben'
+
+                # Use the shared pooled session when the caller didn't supply one;
+                # no per-request session setup or teardown
+                session_to_use = session if session is not None and not session.closed else get_shared_session()
+
                 try:
-                    await session_to_use.close()
-                except Exception as close_err:
-                    logger.warning(f"Error closing session: {close_err}")
-                session_to_use = None
-        
-        if attempt < retries - 1:
-            logger.info(f"Retrying {url} in {backoff_delay:.2f} seconds (attempt {attempt+1}/{retries})")
-            await asyncio.sleep(backoff_delay)
-    
-    # Final cleanup
-    if should_create_session and session_to_use is not None:
-        try:
-            await session_to_use.close()
-        except Exception as e:
-            logger.warning(f"Error closing session on final cleanup: {e}")
-    
-    logger.error(f"Failed to fetch {url} after {retries} attempts")
-    return None
+                    # Get a proxy for this request if available
+                    proxy = get_proxy_for_session(session_to_use)
+
+                    proxy_info = f" via proxy {proxy}" if proxy else ""
+                    logger.info(f"Requesting {url}{proxy_info} with User-Agent: {user_agent[:30]}...")
+
+                    async with session_to_use.get(
+                        url,
+                        timeout=REQUEST_TIMEOUT,
+                        headers=headers,
+                        proxy=proxy
+                    ) as response:
+                        if response.status == 200:
+                            # Success! Get the raw bytes (no charset detection)
+                            content = await response.read()
+                            # Cache the response off-loop so a slow disk doesn't
+                            # stall the other concurrent fetches
+                            if content and len(content) > 100:  # Only cache non-empty responses
+                                await asyncio.to_thread(
+                                    write_cache, cache_path, content,
+                                    _response_expiry(response.headers)
+                                )
+                            # Pacing happens in the caller's RateLimiter before the
+                            # next request, so extraction and cache writes overlap
+                            # with the wait instead of idling here
+                            return content
+                        elif response.status == 429:  # Too Many Requests
+                            logger.warning(f"Rate limited (429) for {url}, waiting longer before retry")
+                            # Use a much longer delay for rate limit errors
+                            wait_time = backoff_delay * 3 + random.uniform(300, 600)  # 5-10 minutes
+                            logger.warning(f"Rate limited (429). Implementing long cooldown of {wait_time:.2f}s for {url}")
+                            await asyncio.sleep(wait_time)
+
+                            # After a rate limit, we should be extremely cautious
+                            if attempt < retries - 1:
+                                logger.info("After rate limit, adding additional cooldown period...")
+                                await asyncio.sleep(random.uniform(120, 240))  # Additional 2-4 minute cooldown
+
+                        elif response.status == 403:  # Forbidden
+                            logger.warning(f"Received 403 Forbidden for {url}, may be blocked")
+                            # Even longer delay for this - potential IP ban/block
+                            wait_time = backoff_delay * 4 + random.uniform(600, 1200)  # 10-20 minutes
+                            logger.warning(f"Possible blocking detected. Implementing very long cooldown of {wait_time:.2f}s")
+                            await asyncio.sleep(wait_time)
+                        else:
+                            logger.warning(f"Failed to fetch {url}, status code: {response.status}")
+                except (ClientError, asyncio.TimeoutError, aiohttp.ClientError) as e:
+                    last_exc = e
+                    logger.warning(f"Error fetching {url} (attempt {attempt+1}/{retries}): {e}")
+
+                if attempt < retries - 1:
+                    logger.info(f"Retrying {url} in {backoff_delay:.2f} seconds (attempt {attempt+1}/{retries})")
+                    await asyncio.sleep(backoff_delay)
+
+            logger.error(f"Failed to fetch {url} after {retries} attempts")
+            if last_exc is not None:
+                # Surface transport failures to the worker so its backoff and
+                # pool-recycling logic can react; HTTP-status failures still
+                # come back as None
+                if isinstance(last_exc, asyncio.TimeoutError) and not isinstance(last_exc, aiohttp.ClientError):
+                    # Type plain request timeouts as transport errors so
+                    # no caller can mistake them for a hard-ceiling expiry
+                    raise aiohttp.ServerTimeoutError(
+                        f"{url} timed out on all {retries} attempts"
+                    ) from last_exc
+                raise last_exc
+            return None
+    except asyncio.TimeoutError:
+        if _timeout_expired(hard_cm):
+            raise HardTimeoutError(
+                f"fetching {url} exceeded the {PROCESS_URL_HARD_TIMEOUT}s hard ceiling"
+            ) from None
+        raise
 
 
 def extract_sku_from_url(url: str) -> Optional[str]:
@@ -612,30 +938,29 @@ def extract_sku_from_url(url: str) -> Optional[str]:
     try:
         # Try to extract from URL path segment
         # Pattern: /d/name-xxxxxxxx/ where xxxxxxxx is the SKU
-        match = re.search(r'/d/[^/]+-(\d+)/?', url)
+        match = _SKU_URL_RE.search(url)
         if match:
             return match.group(1)
-        
-        # Try to extract from query parameters
-        parsed_url = urllib.parse.urlparse(url)
-        query_params = urllib.parse.parse_qs(parsed_url.query)
-        if 'sku' in query_params:
-            return query_params['sku'][0]
-        if 'id' in query_params:
-            return query_params['id'][0]
-        
-        # Last resort: extract last segment from URL path
-        path_segments = parsed_url.path.strip('/').split('/')
-        if path_segments:
-            last_segment = path_segments[-1]
-            if last_segment.isdigit():
-                return last_segment
-        
+
+        # Try to extract from query parameters without allocating a
+        # ParseResult plus dict of lists
+        match = _SKU_QUERY_RE.search(url)
+        if match:
+            return match.group(1)
+
+        # Last resort: check whether the final path segment is numeric.
+        # Plain string ops — urlparse would allocate a ParseResult plus a
+        # list of segments just to look at one of them.
+        path = url.partition('?')[0].partition('#')[0]
+        last_segment = path.rstrip('/').rpartition('/')[2]
+        if last_segment.isdigit():
+            return last_segment
+
+
         # If all attempts failed
         logger.warning(f"Could not extract SKU from URL: {url}")
         # Use a hash of the URL as fallback
-        hash_obj = hashlib.md5(url.encode('utf-8'))
-        return f"hash-{hash_obj.hexdigest()[:8]}"
+        return f"hash-{_hash_url(url)[:8]}"
     except Exception as e:
         logger.error(f"Error extracting SKU from URL {url}: {e}")
         return None
@@ -669,23 +994,41 @@ def extract_sku_from_product(product: Dict) -> Optional[str]:
         return None
 
 
+# Single append-mode handle with a 1 MiB buffer: every crawl record
+# lands on one sequential stream instead of paying per-record
+# open/seek/close on top of the per-SKU files
+_ndjson_handle = None
+
+
+def _append_sku_record(sku: str, data: List[Dict]) -> None:
+    """Append one {sku, data} line to the rolling NDJSON crawl log."""
+    global _ndjson_handle
+    if _ndjson_handle is None:
+        _ndjson_handle = open(SKU_NDJSON_FILE, 'ab', buffering=1 << 20)
+        atexit.register(_ndjson_handle.close)
+    _ndjson_handle.write(_json_dumps_line({'sku': sku, 'data': data}) + b'\n')
+
+
 def save_json_ld_data(data: List[Dict], sku: str) -> bool:
     """Save JSON-LD data to a file named sku-<article_id>.json."""
     try:
         if not data:
             logger.warning(f"No JSON-LD data to save for SKU {sku}")
             return False
-            
+
         # Create directory if it doesn't exist
         pathlib.Path(SKU_DATA_DIR).mkdir(exist_ok=True)
-        
+
         # Generate filename
         file_path = pathlib.Path(SKU_DATA_DIR) / f"{SKU_FILE_PREFIX}{sku}.json"
-        
-        # Save to file with pretty formatting
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            
+
+        # Save to file with pretty formatting as a single bytes write
+        with open(file_path, 'wb') as f:
+            f.write(_json_dumps(data))
+
+        # Also journal the record to the buffered sequential log
+        _append_sku_record(sku, data)
+
         logger.info(f"Saved JSON-LD data to {file_path}")
         return True
     except Exception as e:
@@ -699,23 +1042,71 @@ class StateManager:
         self.state_file = state_file
         self.processed_urls = set()
         self.processed_skus = set()
-        self.file_progress = {}  # filename -> list of processed URLs
+        self.file_progress = {}  # filename -> {'done': set of URLs, 'expected': int}
         self.cached_operations = 0  # Counter for cached operations
         self.total_processed = 0  # Counter for total processed operations
         self.lock = asyncio.Lock()
+        # Persistence is batched: mutators only set the dirty flag and the
+        # background flusher writes at most once per interval, instead of
+        # rewriting the full state file after every URL
+        self._dirty = False
+        self._flush_interval = 5.0  # seconds between background flushes
+        self._flusher_task = None
+        # Workers drop processed records here; a single background writer
+        # applies them in batches so the worker hot path is a put_nowait
+        self._pending_marks: asyncio.Queue = asyncio.Queue()
+        self._mark_writer_task = None
+        self.journal_file = self.state_file + '.jsonl'
+        self.pickle_file = self.state_file + '.pkl'
         self._load_state()
+        # Bloom front-end: no false negatives, so a miss is a definite
+        # "not processed" without touching the sets
+        if Bloom is not None:
+            self.url_bloom = Bloom(1_000_000, 0.001)
+            self.sku_bloom = Bloom(1_000_000, 0.001)
+            for url in self.processed_urls:
+                self.url_bloom.add(url)
+            for sku in self.processed_skus:
+                self.sku_bloom.add(sku)
+        else:
+            self.url_bloom = None
+            self.sku_bloom = None
+        self.bloom_near_misses = 0  # bloom said maybe, set said no
+        # Journal appends are O(1) per processed URL; the periodic
+        # snapshot truncates the journal once the full state is on disk
+        self._journal_fh = open(self.journal_file, 'ab', buffering=1 << 16)
+        atexit.register(self._flush_sync)
     
     def _load_state(self) -> None:
         """Load state from file if it exists."""
         try:
+            # The pickle snapshot is authoritative; the JSON file is only
+            # read when migrating from an older run
+            pickle_path = pathlib.Path(self.pickle_file)
             state_path = pathlib.Path(self.state_file)
-            if state_path.exists():
-                with open(state_path, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                
+            if pickle_path.exists():
+                with open(pickle_path, 'rb') as f:
+                    state = pickle.load(f)
+            elif state_path.exists():
+                state = _json_loads(state_path.read_bytes())
+            else:
+                state = None
+
+            if state is not None:
                 self.processed_urls = set(state.get('processed_urls', []))
                 self.processed_skus = set(state.get('processed_skus', []))
-                self.file_progress = state.get('file_progress', {})
+                # Sets keep the per-file membership check O(1); the
+                # serializer turns them back into lists on save. Legacy
+                # states stored a bare URL list with no expected count.
+                self.file_progress = {}
+                for fn, progress in state.get('file_progress', {}).items():
+                    if isinstance(progress, dict):
+                        self.file_progress[fn] = {
+                            'done': set(progress.get('done', ())),
+                            'expected': progress.get('expected', 0),
+                        }
+                    else:
+                        self.file_progress[fn] = {'done': set(progress), 'expected': 0}
                 self.cached_operations = state.get('cached_operations', 0)
                 self.total_processed = state.get('total_processed', 0)
                 
@@ -723,8 +1114,8 @@ class StateManager:
                 logger.info(f"Cached operations: {self.cached_operations}/{self.total_processed}")
                 
                 # Log progress for each file
-                for filename, urls in self.file_progress.items():
-                    logger.info(f"  File {filename}: {len(urls)} URLs processed")
+                for filename, progress in self.file_progress.items():
+                    logger.info(f"  File {filename}: {len(progress['done'])} URLs processed")
             else:
                 logger.info("No existing state file, starting fresh")
         except Exception as e:
@@ -735,82 +1126,271 @@ class StateManager:
             self.file_progress = {}
             self.cached_operations = 0
             self.total_processed = 0
-    
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        """Re-apply journal entries recorded after the last snapshot."""
+        try:
+            with open(self.journal_file, 'rb') as f:
+                replayed = 0
+                for line in f:
+                    try:
+                        entry = _json_loads(line)
+                    except ValueError:
+                        continue  # torn tail line from a crash
+                    url = entry.get('u')
+                    if url:
+                        self.processed_urls.add(url)
+                        if entry.get('f'):
+                            self.file_progress.setdefault(
+                                entry['f'], {'done': set(), 'expected': 0}
+                            )['done'].add(url)
+                    if entry.get('s'):
+                        self.processed_skus.add(entry['s'])
+                    self.total_processed += 1
+                    if entry.get('c'):
+                        self.cached_operations += 1
+                    replayed += 1
+                if replayed:
+                    logger.info(f"Replayed {replayed} journal entries since last snapshot")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to replay state journal: {e}")
+
+    def _snapshot(self) -> Dict:
+        """Build a serializable snapshot of the current state.
+
+        The sets go in as-is; the serializer turns them into lists via
+        default=list without an extra copy here.
+        """
+        return {
+            'processed_urls': self.processed_urls,
+            'processed_skus': self.processed_skus,
+            'file_progress': self.file_progress,
+            'cached_operations': self.cached_operations,
+            'total_processed': self.total_processed,
+            'last_updated': datetime.now().isoformat()
+        }
+
+    def _write_state(self, state: Dict) -> None:
+        """Write a state snapshot atomically (tmp + fsync + rename).
+
+        fsync happens only here, once per snapshot interval — journal
+        appends stay buffered — so a crash can cost at most the journal
+        tail, never a torn or zero-length state file.
+
+        The snapshot is pickle protocol 5: sets serialize natively and
+        come out a fraction of the JSON array size. Use --export-json
+        for a readable dump.
+        """
+        tmp_path = self.pickle_file + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=5)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.pickle_file)
+
+    def export_json(self) -> None:
+        """Write a one-off JSON copy of the current state for inspection."""
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps_state(self._snapshot()))
+        os.replace(tmp_path, self.state_file)
+        logger.info(f"Exported state to {self.state_file}")
+
+    def _truncate_journal(self) -> None:
+        """Drop journal entries now covered by the on-disk snapshot."""
+        self._journal_fh.seek(0)
+        self._journal_fh.truncate()
+
     async def save_state(self) -> None:
         """Save current state to file."""
         async with self.lock:
             try:
-                state = {
-                    'processed_urls': list(self.processed_urls),
-                    'processed_skus': list(self.processed_skus),
-                    'file_progress': self.file_progress,
-                    'cached_operations': self.cached_operations,
-                    'total_processed': self.total_processed,
-                    'last_updated': datetime.now().isoformat()
-                }
-                
-                with open(self.state_file, 'w', encoding='utf-8') as f:
-                    json.dump(state, f, indent=2, ensure_ascii=False)
-                
+                # The lock keeps the sets stable while a worker thread
+                # serializes and writes them, so the event loop keeps
+                # servicing fetches instead of stalling on disk I/O
+                await asyncio.to_thread(self._write_state, self._snapshot())
+                self._truncate_journal()
+                self._dirty = False
                 logger.debug(f"Saved state: {len(self.processed_urls)} URLs processed, {self.cached_operations} cached operations")
             except Exception as e:
                 logger.error(f"Failed to save state: {e}")
+
+    def _flush_sync(self) -> None:
+        """Last-chance synchronous flush for interpreter shutdown."""
+        self._drain_marks_sync()
+        if not self._dirty:
+            return
+        try:
+            self._write_state(self._snapshot())
+            self._truncate_journal()
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Failed to flush state on shutdown: {e}")
+
+    def start_flusher(self) -> None:
+        """Start the background flush and mark-writer tasks (call from inside the event loop)."""
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flusher())
+        if self._mark_writer_task is None or self._mark_writer_task.done():
+            self._mark_writer_task = asyncio.create_task(self._mark_writer())
+
+    async def _flusher(self) -> None:
+        """Periodically persist state while it is dirty."""
+        try:
+            while True:
+                await asyncio.sleep(self._flush_interval)
+                if self._dirty:
+                    await self.save_state()
+        except asyncio.CancelledError:
+            # Flush whatever is pending before going away
+            if self._dirty:
+                await self.save_state()
+            raise
+
+    async def close(self) -> None:
+        """Stop the background tasks and flush pending state."""
+        if self._mark_writer_task is not None:
+            self._mark_writer_task.cancel()
+            try:
+                await self._mark_writer_task
+            except asyncio.CancelledError:
+                pass
+            self._mark_writer_task = None
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+        if self._dirty:
+            await self.save_state()
     
-    async def mark_processed(self, url: str, sku: str, filename: str, used_cache: bool = False) -> None:
-        """Mark a URL and SKU as processed."""
-        async with self.lock:
+    def mark_processed_nowait(self, url: str, sku: str, filename: str, used_cache: bool = False) -> None:
+        """Queue a processed record for the background mark writer."""
+        self._pending_marks.put_nowait((url, sku, filename, used_cache))
+
+    def _apply_marks_sync(self, entries) -> None:
+        """Apply a batch of processed records and journal them in one write."""
+        lines = []
+        for url, sku, filename, used_cache in entries:
             self.processed_urls.add(url)
+            if self.url_bloom is not None:
+                self.url_bloom.add(url)
             if sku:
                 self.processed_skus.add(sku)
-            
-            # Update file progress
-            if filename not in self.file_progress:
-                self.file_progress[filename] = []
-            
-            if url not in self.file_progress[filename]:
-                self.file_progress[filename].append(url)
-            
+                if self.sku_bloom is not None:
+                    self.sku_bloom.add(sku)
+
+            # Update file progress; set membership keeps this O(1)
+            self.file_progress.setdefault(
+                filename, {'done': set(), 'expected': 0}
+            )['done'].add(url)
+
             # Update cache statistics
             self.total_processed += 1
             if used_cache:
                 self.cached_operations += 1
-                
-            # Save state after each update
-            await self.save_state()
+
+            # O(1) durability: one journal line now, the flusher writes
+            # the full snapshot later and truncates the journal
+            lines.append(
+                _json_dumps_line({'u': url, 's': sku, 'f': filename, 'c': used_cache}) + b'\n'
+            )
+        self._journal_fh.write(b''.join(lines))
+        self._dirty = True
+
+    async def _apply_marks(self, entries) -> None:
+        """Apply a batch under the lock so snapshots see consistent sets."""
+        async with self.lock:
+            self._apply_marks_sync(entries)
+
+    async def _mark_writer(self) -> None:
+        """Drain queued records in batches: 50 items or 2s, whichever first."""
+        try:
+            while True:
+                entries = [await self._pending_marks.get()]
+                try:
+                    async with _timeout(2.0):
+                        while len(entries) < 50:
+                            entries.append(await self._pending_marks.get())
+                except asyncio.TimeoutError:
+                    pass
+                await self._apply_marks(entries)
+        except asyncio.CancelledError:
+            # Apply whatever is still queued before going away
+            entries = []
+            while not self._pending_marks.empty():
+                entries.append(self._pending_marks.get_nowait())
+            if entries:
+                await self._apply_marks(entries)
+            raise
+
+    def _drain_marks_sync(self) -> None:
+        """Apply any still-queued records without awaiting (shutdown path)."""
+        entries = []
+        while not self._pending_marks.empty():
+            entries.append(self._pending_marks.get_nowait())
+        if entries:
+            self._apply_marks_sync(entries)
     
     def is_processed(self, url: str) -> bool:
         """Check if a URL has already been processed."""
+        if self.url_bloom is not None:
+            if url not in self.url_bloom:
+                return False
+            if url not in self.processed_urls:
+                self.bloom_near_misses += 1
+                return False
+            return True
         return url in self.processed_urls
-    
+
     def is_sku_processed(self, sku: str) -> bool:
         """Check if a SKU has already been processed."""
+        if self.sku_bloom is not None:
+            if sku not in self.sku_bloom:
+                return False
+            if sku not in self.processed_skus:
+                self.bloom_near_misses += 1
+                return False
+            return True
         return sku in self.processed_skus
     
+    def set_expected(self, filename: str, count: int) -> None:
+        """Record how many product URLs a catalog file contains."""
+        self.file_progress.setdefault(
+            filename, {'done': set(), 'expected': 0}
+        )['expected'] = count
+        self._dirty = True
+
     def is_file_processed(self, filename: str) -> bool:
         """Check if a file has been completely processed."""
-        # Check if file exists in progress tracking and has entries
-        if filename not in self.file_progress:
+        progress = self.file_progress.get(filename)
+        if not progress:
             return False
-        
-        # Check if the file has at least some processed URLs
-        if len(self.file_progress[filename]) == 0:
+
+        done = len(progress['done'])
+        if done == 0:
             return False
-            
-        # File is considered processed if it has more than a threshold of URLs completed
-        # For simplicity, any file with 5+ processed URLs is considered "done"
-        # This can be adjusted based on your specific needs
-        return len(self.file_progress[filename]) >= 5
+
+        # When we know how many URLs the file holds, "done" means all of
+        # them — a crash mid-file no longer writes off the remainder
+        expected = progress.get('expected', 0)
+        if expected > 0:
+            return done >= expected
+
+        # Legacy state without an expected count keeps the old heuristic
+        return done >= 5
         
     def should_process_file(self, filename: str) -> bool:
         """Determine if a file should be processed based on resume mode."""
         # In non-resume mode, process all files
-        try:
-            if not args.resume:
-                return True
-        except NameError:
-            # args might not be defined yet if called before parse_arguments()
+        if not RESUME_MODE:
             return True
-            
+
         # In resume mode, only process files that haven't been completed
         return not self.is_file_processed(filename)
     
@@ -823,10 +1403,32 @@ class StateManager:
         return self.total_processed
 
 
+# Built once: frozenset membership beats a per-call list literal scan
+# when these run for every JSON-LD item in a crawl
+_PRODUCT_TYPES = frozenset(('Product', 'Offer', 'WebPage', 'ItemPage'))
+_PRODUCT_FIELDS = frozenset(('name', 'description', 'offers', 'brand', 'image'))
+
+
+# Positive-only memo: found data never changes within a run, but a miss
+# must stay a miss — a SKU fetched and saved later in the run has to be
+# served from disk on its next occurrence, not re-fetched over HTTP
+_sku_data_cache: Dict[str, List[Dict]] = {}
+
+
 def check_existing_sku_data(sku: str) -> Optional[List[Dict]]:
+    """Memoized wrapper around _load_existing_sku_data; see above."""
+    data = _sku_data_cache.get(sku)
+    if data is None:
+        data = _load_existing_sku_data(sku)
+        if data is not None:
+            _sku_data_cache[sku] = data
+    return data
+
+
+def _load_existing_sku_data(sku: str) -> Optional[List[Dict]]:
     """
     Check if there's already an existing JSON file for the SKU and read its data.
-    
+
     Args:
         sku: The SKU/article ID to check
         
@@ -835,18 +1437,28 @@ def check_existing_sku_data(sku: str) -> Optional[List[Dict]]:
     """
     try:
         file_path = pathlib.Path(SKU_DATA_DIR) / f"{SKU_FILE_PREFIX}{sku}.json"
-        
-        # Check if file exists
-        if not file_path.exists():
+
+        # One stat answers both existence and age
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
             return None
-            
+
         # Check age of file - consider recent files valid without re-validation
-        file_age = time.time() - file_path.stat().st_mtime
-        recent_threshold = 60 * 60 * 24 * 7  # 7 days
-        
-        # Read file content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        file_age = time.time() - st.st_mtime
+
+        # Slurp small files in one read; mmap large ones so orjson
+        # decodes straight out of the page cache without copying first
+        if _HAS_ORJSON and st.st_size > 262144:
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        data = _json_loads(view)
+                    finally:
+                        view.release()
+        else:
+            data = _json_loads(file_path.read_bytes())
             
         # Basic validation - must be a list of dictionaries
         if not isinstance(data, list):
@@ -859,22 +1471,21 @@ def check_existing_sku_data(sku: str) -> Optional[List[Dict]]:
             return None
             
         # If the file is recent enough, we trust it without deeper validation
-        if file_age < recent_threshold:
+        if file_age < RECENT_SKU_THRESHOLD_SEC:
             logger.info(f"Found recent valid SKU data file: {file_path}")
             return data
             
         # For older files, do more thorough validation
         # Look for product-specific fields that indicate valid product data
-        product_fields = ['name', 'description', 'offers', 'brand', 'image']
         has_product_fields = False
-        
+
         for item in data:
             if not isinstance(item, dict):
                 continue
-                
+
             # Check if it's a product and has some required fields
-            if item.get('@type') in ['Product', 'Offer', 'WebPage', 'ItemPage'] and \
-               any(field in item for field in product_fields):
+            if item.get('@type') in _PRODUCT_TYPES and \
+               not _PRODUCT_FIELDS.isdisjoint(item):
                 has_product_fields = True
                 break
                 
@@ -885,7 +1496,8 @@ def check_existing_sku_data(sku: str) -> Optional[List[Dict]]:
             logger.warning(f"Existing SKU file {file_path} lacks product data")
             return None
             
-    except json.JSONDecodeError:
+    except ValueError:
+        # Covers both json.JSONDecodeError and orjson.JSONDecodeError
         logger.warning(f"Invalid JSON in existing SKU file for {sku}")
         return None
     except Exception as e:
@@ -893,43 +1505,144 @@ def check_existing_sku_data(sku: str) -> Optional[List[Dict]]:
         return None
 
 
-def extract_json_ld(html: str, url: str) -> List[Dict]:
-    """Extract JSON-LD data from HTML."""
-    base_url = get_base_url(html, url)
-    data = extruct.extract(html, base_url=base_url, syntaxes=['json-ld'])
+# selectolax tokenizes HTML in C and copes with markup the regex scan
+# trips over (nested quotes, comments inside scripts); the regex stays
+# as the zero-dependency fallback
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+
+    def _ld_script_blocks(html: bytes) -> List:
+        tree = _SelectolaxParser(html)
+        return [
+            node.text()
+            for node in tree.css('script[type="application/ld+json"]')
+        ]
+except ImportError:
+    def _ld_script_blocks(html: bytes) -> List:
+        return [m.group(1) for m in _LDJSON_RE.finditer(html)]
+
+
+def extract_json_ld(html: bytes, url: str) -> List[Dict]:
+    """
+    Extract JSON-LD data from raw HTML bytes.
+
+    We only consume JSON-LD, so a targeted script-tag scan replaces
+    extruct's full multi-syntax parse (lxml DOM build plus microdata/RDFa/
+    OpenGraph machinery). extruct runs only when the scan finds nothing,
+    and only then are the bytes decoded.
+    """
+    json_ld_data = []
+    for block in _ld_script_blocks(html):
+        try:
+            parsed = _json_loads(block)
+        except ValueError as e:
+            logger.warning(f"Failed to parse JSON-LD block: {e}")
+            continue
+        if isinstance(parsed, list):
+            json_ld_data.extend(parsed)
+        else:
+            json_ld_data.append(parsed)
+    if json_ld_data:
+        return json_ld_data
+
+    # Fall back to the full parse for unusual markup
+    html_text = html.decode('utf-8', errors='replace')
+    base_url = get_base_url(html_text, url)
+    data = extruct.extract(html_text, base_url=base_url, syntaxes=['json-ld'])
     return data.get('json-ld', [])
 
 
+_EXTRA_IMAGE_PROPS = ('thumbnail', 'primaryImageOfPage')
+
+
+def _collect_item_images(item: Dict, image_urls: set) -> None:
+    """Add the image URLs found on one JSON-LD item to the set."""
+    # Check for different image property patterns in JSON-LD
+    image = item.get('image')
+    if isinstance(image, str):
+        image_urls.add(image)
+    elif isinstance(image, list):
+        image_urls.update(img for img in image if isinstance(img, str))
+    elif isinstance(image, dict) and 'url' in image:
+        image_urls.add(image['url'])
+
+    # Check for other image properties
+    for prop in _EXTRA_IMAGE_PROPS:
+        value = item.get(prop)
+        if isinstance(value, str):
+            image_urls.add(value)
+        elif isinstance(value, dict) and 'url' in value:
+            image_urls.add(value['url'])
+
+
 def extract_image_urls(json_ld_data: List[Dict]) -> List[str]:
     """Extract image URLs from JSON-LD data."""
-    image_urls = []
-    
+    # Deduplicate as we go instead of building a duplicate-laden list
+    # and rehashing it at the end
+    image_urls = set()
     for item in json_ld_data:
-        # Check for different image property patterns in JSON-LD
-        if isinstance(item.get('image'), str):
-            image_urls.append(item['image'])
-        elif isinstance(item.get('image'), list):
-            image_urls.extend([img for img in item['image'] if isinstance(img, str)])
-        elif isinstance(item.get('image'), dict) and 'url' in item['image']:
-            image_urls.append(item['image']['url'])
-            
-        # Check for other image properties
-        for prop in ['thumbnail', 'primaryImageOfPage']:
-            if isinstance(item.get(prop), str):
-                image_urls.append(item[prop])
-            elif isinstance(item.get(prop), dict) and 'url' in item[prop]:
-                image_urls.append(item[prop]['url'])
-    
-    return list(set(image_urls))  # Remove duplicates
+        _collect_item_images(item, image_urls)
+    return list(image_urls)
+
+
+# Image URLs per SKU, memoized for the run: repeated product references
+# for the same SKU (common since files cluster by seller) skip the
+# JSON-LD walk entirely on the cache-hit path
+_sku_image_urls: Dict[str, List[str]] = {}
+
+
+def _image_urls_for_sku(sku: str, json_ld_data: List[Dict]) -> List[str]:
+    """Return the image URLs for a SKU's existing data, memoized per run."""
+    urls = _sku_image_urls.get(sku)
+    if urls is None:
+        urls = extract_image_urls(json_ld_data)
+        _sku_image_urls[sku] = urls
+    return urls
+
+
+def extract_json_ld_and_images(html: bytes, url: str) -> Tuple[List[Dict], List[str]]:
+    """
+    Extract JSON-LD data and its image URLs in one traversal.
+
+    Fuses extract_json_ld and extract_image_urls so the per-URL hot path
+    collects images while the items are appended instead of walking the
+    parsed list a second time.
+    """
+    json_ld_data = []
+    image_urls = set()
+    for block in _ld_script_blocks(html):
+        try:
+            parsed = _json_loads(block)
+        except ValueError as e:
+            logger.warning(f"Failed to parse JSON-LD block: {e}")
+            continue
+        for item in (parsed if isinstance(parsed, list) else (parsed,)):
+            json_ld_data.append(item)
+            if isinstance(item, dict):
+                _collect_item_images(item, image_urls)
+
+    if not json_ld_data:
+        # The scan found nothing, so rerunning it inside the fallback
+        # path is cheap; collect images from whatever extruct returns
+        json_ld_data = extract_json_ld(html, url)
+        for item in json_ld_data:
+            if isinstance(item, dict):
+                _collect_item_images(item, image_urls)
+
+    return json_ld_data, list(image_urls)
 
 
 def find_json_files() -> List[str]:
     """Find JSON files in the current directory, excluding specified files."""
-    json_files = []
-    for filename in os.listdir('.'):
-        if filename.endswith('.json') and filename not in EXCLUDED_FILES:
-            json_files.append(filename)
-    return json_files
+    # scandir DirEntry objects carry cached type info, so is_file()
+    # doesn't cost an extra stat per entry
+    with os.scandir('.') as entries:
+        return [
+            entry.name for entry in entries
+            if entry.name.endswith('.json')
+            and entry.name not in EXCLUDED_FILES
+            and entry.is_file()
+        ]
 
 
 def extract_product_urls(json_data: List[Dict]) -> List[Tuple[str, Dict]]:
@@ -938,37 +1651,33 @@ def extract_product_urls(json_data: List[Dict]) -> List[Tuple[str, Dict]]:
     Returns a list of tuples (url, product_reference) where product_reference
     is a reference to the product object in the JSON data.
     """
+    # One type check per node; type(x) is dict skips the subclass
+    # machinery of isinstance, and nothing here raises, so the old inner
+    # try/except and repeat checks are gone
     product_data = []
-    
+    append = product_data.append
+
     for item in json_data:
-        if isinstance(item, dict) and item.get('@type') == 'ItemList':
-            item_list = item.get('itemListElement', [])
-            for list_item in item_list:
-                if isinstance(list_item, dict) and list_item.get('@type') == 'ListItem':
-                    product = list_item.get('item', {})
-                    if isinstance(product, dict) and product.get('@type') == 'Product':
-                        url = product.get('url')
-                        if url:
-                            try:
-                                # Verify that URL is a string
-                                if not isinstance(url, str):
-                                    logger.error(f"Skipping non-string URL: {url} (type: {type(url)})")
-                                    continue
-                                    
-                                # Verify that product is indeed a dictionary
-                                if not isinstance(product, dict):
-                                    logger.error(f"Skipping non-dictionary product: {product} (type: {type(product)})")
-                                    continue
-                                    
-                                logger.debug(f"Extracted product URL: {url}")
-                                product_data.append((url, product))
-                            except Exception as e:
-                                logger.error(f"Error processing product: {e}")
-    
+        if type(item) is not dict or item.get('@type') != 'ItemList':
+            continue
+        for list_item in item.get('itemListElement', ()):
+            if type(list_item) is not dict or list_item.get('@type') != 'ListItem':
+                continue
+            product = list_item.get('item')
+            if type(product) is not dict or product.get('@type') != 'Product':
+                continue
+            url = product.get('url')
+            if type(url) is not str:
+                if url is not None:
+                    logger.error(f"Skipping non-string URL: {url} (type: {type(url)})")
+                continue
+            logger.debug(f"Extracted product URL: {url}")
+            append((url, product))
+
     return product_data
 
 
-async def process_json_file(filename: str, semaphore: asyncio.Semaphore, rate_limiter: RateLimiter, state_manager: StateManager) -> None:
+async def process_json_file(filename: str, rate_limiter: RateLimiter, state_manager: StateManager) -> None:
     """Process a single JSON file."""
     try:
         # Check if we should process this file in resume mode
@@ -976,9 +1685,9 @@ async def process_json_file(filename: str, semaphore: asyncio.Semaphore, rate_li
             logger.info(f"Skipping {filename} - already processed in previous run")
             return
             
-        # Load JSON file
-        with open(filename, 'r') as file:
-            json_data = json.load(file)
+        # Load JSON file as raw bytes for the C decoder
+        with open(filename, 'rb') as file:
+            json_data = _json_loads(file.read())
         
         logger.info(f"Processing {filename}")
         
@@ -993,784 +1702,318 @@ async def process_json_file(filename: str, semaphore: asyncio.Semaphore, rate_li
         # Create a request queue
         request_queue = RequestQueue()
         
-        # Create a session for HTTP requests with cookies enabled and connection pooling
-        conn = aiohttp.TCPConnector(
-            limit=MAX_CONCURRENT_REQUESTS,
-            ssl=False,
-            ttl_dns_cache=300,  # Cache DNS results for 5 minutes
-            enable_cleanup_closed=True,
-            force_close=False,
-            limit_per_host=1  # Limit connections per host
-        )
-        
-        # Use a cookie jar to maintain session cookies
-        cookie_jar = aiohttp.CookieJar(unsafe=True)  # Allow cookies from non-secure connections
-        
-        # Create client session with the connection
-        async with aiohttp.ClientSession(
-            connector=conn,
-            cookie_jar=cookie_jar,
-            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT * 2)
-        ) as session:
-            # Add all product URLs to the queue (skipping already processed ones in resume mode)
-            logger.info(f"Found {len(product_data)} products in {filename}")
-            queued_count = 0
-            skipped_count = 0
-            
-            for url, product_ref in product_data:
-                try:
-                    # Skip already processed URLs in resume mode
-                    try:
-                        if args.resume and state_manager.is_processed(url):
-                            logger.info(f"Skipping already processed URL: {url}")
-                            skipped_count += 1
-                            continue
-                    except NameError:
-                        # args might not be defined yet
-                        pass
-                    
-                    # Extract SKU to check if processed
-                    sku = extract_sku_from_product(product_ref) or extract_sku_from_url(url)
-                    try:
-                        if sku and args.resume and state_manager.is_sku_processed(sku):
-                            logger.info(f"Skipping already processed SKU: {sku}")
-                            skipped_count += 1
-                            continue
-                    except NameError:
-                        # args might not be defined yet
-                        pass
-                        
-                    logger.info(f"Adding to queue: URL={url}, product_ref type={type(product_ref)}, filename={filename}")
-                    added = await request_queue.put((url, product_ref, filename))  # Include filename for tracking
-                    if added:
-                        logger.debug(f"Added to queue: {url}")
-                        queued_count += 1
-                    else:
-                        logger.debug(f"Skipped duplicate URL in queue: {url}")
-                        skipped_count += 1
-                except Exception as e:
-                    logger.error(f"Error adding URL to queue: {url}, error: {e}")
+        # All files share the pooled session: keep-alive connections,
+        # DNS cache and TLS session tickets survive across files instead
+        # of being torn down and re-established per file
+        session = get_shared_session()
+        # Add all product URLs to the queue (skipping already processed ones in resume mode)
+        logger.info(f"Found {len(product_data)} products in {filename}")
+        # Record the total so is_file_processed can tell a finished
+        # file from one interrupted mid-crawl
+        state_manager.set_expected(filename, len(product_data))
+        queued_count = 0
+        skipped_count = 0
+        
+        # Bulk-filter first (resume checks only touch in-memory
+        # state), then hand the survivors to the queue in a single
+        # call instead of one awaited put per URL
+        to_enqueue = []
+        for url, product_ref in product_data:
+            # Resolve the SKU once here; workers and the state manager
+            # read it off the tuple instead of re-deriving it per stage
+            sku = extract_sku_from_product(product_ref) or extract_sku_from_url(url)
+            if RESUME_MODE:
+                # Skip already processed URLs/SKUs in resume mode
+                if state_manager.is_processed(url):
+                    logger.info(f"Skipping already processed URL: {url}")
                     skipped_count += 1
-                    
-            logger.info(f"Added {queued_count} URLs to queue, skipped {skipped_count} URLs")
-            
-            logger.info(f"Queue contains {request_queue.pending_count} pending URLs")
-            
-            # Create worker tasks to process the queue
-            tasks = []
+                    continue
+                if sku and state_manager.is_sku_processed(sku):
+                    logger.info(f"Skipping already processed SKU: {sku}")
+                    skipped_count += 1
+                    continue
+            to_enqueue.append((url, product_ref, filename, sku))
+
+        # Workers must exist before the producer starts feeding the
+        # bounded queue, otherwise a full queue would block put_many
+        # with nobody draining it
+        # The TaskGroup ties worker lifetimes to this block: the group
+        # exits once every worker has eaten its shutdown sentinel, a
+        # failing task cancels its siblings instead of leaking them, and
+        # the manual join/cancel/gather ladder disappears. The per-
+        # iteration hard timeout bounds how long any worker can run.
+        async with asyncio.TaskGroup() as tg:
             for i in range(MAX_CONCURRENT_REQUESTS):
                 logger.debug(f"Creating worker {i+1}/{MAX_CONCURRENT_REQUESTS}")
-                try:
-                    task = asyncio.create_task(
-                        worker(session, request_queue, semaphore, rate_limiter, state_manager)
-                    )
-                    tasks.append(task)
-                except Exception as e:
-                    logger.error(f"Error creating worker task: {e}")
-            
-            # Wait for the queue to be processed
-            try:
-                logger.debug(f"Waiting for queue to complete processing ({request_queue.pending_count} items pending)")
-                # Use a shorter timeout for development or testing
-                timeout = 600 if args.verbose else 3600  # 10 minutes in verbose mode, 1 hour otherwise
-                await asyncio.wait_for(request_queue.join(), timeout=timeout)
-                logger.debug(f"Queue processing complete")
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout waiting for queue to complete")
-                # Continue anyway
-            except KeyboardInterrupt:
-                logger.info("Keyboard interrupt detected, initiating graceful shutdown")
-            except Exception as e:
-                logger.error(f"Error waiting for queue: {e}")
-            
-            # Cancel worker tasks with proper cleanup
-            logger.debug("Cancelling worker tasks")
-            for task in tasks:
-                if not task.done():
-                    task.cancel()
-            
-            # Wait for tasks to be cancelled with timeout
-            try:
-                # Only wait a short time for tasks to clean up
-                await asyncio.wait_for(
-                    asyncio.gather(*tasks, return_exceptions=True),
-                    timeout=5.0
+                tg.create_task(
+                    worker(session, request_queue, rate_limiter, state_manager)
                 )
-                logger.debug("Worker tasks cancelled successfully")
-            except asyncio.TimeoutError:
-                logger.warning("Some worker tasks did not shut down gracefully")
-            except asyncio.CancelledError:
-                logger.debug("Task cancellation interrupted")
+
+            try:
+                queued_count = await request_queue.put_many(to_enqueue)
             except Exception as e:
-                logger.error(f"Error during worker task cleanup: {e}")
+                logger.error(f"Error adding URLs to queue: {e}")
+            skipped_count += len(to_enqueue) - queued_count
+
+            logger.info(f"Added {queued_count} URLs to queue, skipped {skipped_count} URLs")
+
+            # Everything for this file is queued, so push one shutdown
+            # sentinel per worker: they block in queue.get() and wake
+            # exactly once instead of polling an empty queue on a timer
+            for _ in range(MAX_CONCURRENT_REQUESTS):
+                await request_queue.queue.put(None)
+
+        # Save updated JSON data with pretty formatting as one bytes write
+        with open(filename, 'wb') as file:
+            file.write(_json_dumps(json_data))
 
-        # Save updated JSON data
-        with open(filename, 'w') as file:
-            json.dump(json_data, file, indent=2)
-        
         logger.info(f"Updated {filename} successfully")
-    
-    except json.JSONDecodeError as e:
+
+    except ValueError as e:
+        # Covers both json.JSONDecodeError and orjson.JSONDecodeError
         logger.error(f"Error parsing JSON in {filename}: {e}")
     except Exception as e:
         logger.error(f"Error processing {filename}: {e}")
 
 
 async def worker(
-    session: aiohttp.ClientSession, 
-    request_queue: RequestQueue, 
-    semaphore: asyncio.Semaphore, 
+    session: aiohttp.ClientSession,
+    request_queue: RequestQueue,
     rate_limiter: RateLimiter,
     state_manager: StateManager
 ) -> None:
     """
     Worker function that processes URLs from the queue.
-    
+
+    Concurrency is capped by the worker count itself: with a bounded
+    queue there is no separate semaphore to acquire per request.
+
     Args:
         session: The shared aiohttp ClientSession
         request_queue: Queue of URLs to process
-        semaphore: Semaphore to limit concurrent requests
         rate_limiter: Rate limiter to control request frequency
         state_manager: State manager to track progress
     """
     # Generate a unique ID for this worker for logging
-    worker_id = str(uuid.uuid4())[:6]
+    worker_id = _next_session_id()
     logger.info(f"Worker {worker_id} started")
-    
-    # Track empty queue occurrences to determine when to exit
-    empty_queue_count = 0
-    max_empty_count = 5  # Exit after checking an empty queue this many times
-    
-    # Create a worker-specific session with its own connection pool
-    current_session = None
-    session_renewal_count = 0
-    session_max_renewal = 5  # Renew session after this many requests
-    
-    # Track session health and error patterns
-    session_health = 100  # Health score from 0-100
-    error_types = {}  # Track frequency of different error types
-    last_errors = []  # Recent errors for pattern detection
-    backoff_base = 1.0  # Base backoff time in seconds, adjusted dynamically
-    consecutive_errors = 0  # Track consecutive errors
-
-    # Helper function to safely create or renew a session with optimized settings
-    async def create_safe_session(force_new=False, error_type=None):
-        nonlocal current_session, session_health, error_types, backoff_base, consecutive_errors
-        
-        # Update error tracking if an error type was provided
-        if error_type:
-            if error_type in error_types:
-                error_types[error_type] += 1
-            else:
-                error_types[error_type] = 1
-                
-            # Add to recent errors list (keep last 5)
-            last_errors.append(error_type)
-            if len(last_errors) > 5:
-                last_errors.pop(0)
-                
-            # Consecutive errors tracking
-            consecutive_errors += 1
-            
-            # Decrease session health based on error type
-            if error_type in ('connection', 'timeout'):
-                session_health -= 30  # Connection errors impact health more
-            elif error_type in ('http_error', 'rate_limit'):
-                session_health -= 20
-            else:
-                session_health -= 10
-                
-            # Adjust base backoff time based on error patterns
-            if consecutive_errors > 3:
-                backoff_base = min(backoff_base * 1.5, 10.0)  # Increase backoff up to 10s
-        else:
-            # Reset consecutive errors on successful operations
-            consecutive_errors = 0
-            # Slowly recover session health on success
-            session_health = min(100, session_health + 5)
-        
-        # Force session renewal if health is too low
-        if session_health < 40:
-            logger.warning(f"Worker {worker_id}: Session health low ({session_health}), forcing renewal")
-            force_new = True
-            # Reset health after renewal
-            session_health = 70  # Start new session at 70% health
-        
-        # Ensure we have a running event loop
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            logger.error(f"Worker {worker_id}: No running event loop found when creating session")
-            return False
-        
-        # Close existing session if it exists and is not already closed
-        if current_session is not None and (force_new or not current_session.closed):
-            try:
-                if not current_session.closed:
-                    # Set a brief timeout for closing to avoid hanging
-                    close_task = asyncio.create_task(current_session.close())
-                    try:
-                        await asyncio.wait_for(close_task, timeout=3.0)
-                        logger.debug(f"Worker {worker_id} closed previous session successfully")
-                    except asyncio.TimeoutError:
-                        logger.warning(f"Worker {worker_id} session close timed out")
-            except Exception as e:
-                logger.warning(f"Worker {worker_id} error closing previous session: {e}")
-            finally:
-                # Set to None to ensure we don't try to reuse an errored session
-                current_session = None
-        
-        # If not forced and session is still valid, return
-        if not force_new and current_session is not None and not current_session.closed:
-            logger.debug(f"Worker {worker_id} reusing existing healthy session")
-            return True
-            
-        # Calculate retry parameters based on error history
-        max_retries = 3 + (consecutive_errors // 2)  # Increase retries after multiple errors
-        max_retries = min(max_retries, 6)  # But cap at reasonable value
-        
-        retry_count = 0
-        
-        # Calculate backoff with jitter to avoid thundering herd
-        def get_backoff_time(attempt):
-            # Exponential backoff with jitter and ceiling
-            jitter = random.uniform(0.8, 1.2)
-            backoff_time = backoff_base * (2 ** attempt) * jitter
-            return min(backoff_time, 30.0)  # Cap at 30 seconds
-        
-        while retry_count < max_retries:
-            try:
-                # Create connection with optimized pool settings based on observed patterns
-                use_limit = 1
-                use_limit_per_host = 1
-                
-                # Set DNS cache TTL longer for stable hosts
-                dns_cache_ttl = 300  # 5 minutes default
-                
-                # For unstable connections (based on error history), use stricter settings
-                if consecutive_errors > 2:
-                    dns_cache_ttl = 60  # Shorter DNS cache when seeing many errors
-                
-                # Create optimized connection pool
-                conn = aiohttp.TCPConnector(
-                    ssl=False, 
-                    limit=use_limit,  # Overall connection limit
-                    limit_per_host=use_limit_per_host,  # Per-host connection limit
-                    ttl_dns_cache=dns_cache_ttl,  # DNS cache TTL
-                    enable_cleanup_closed=True,  # Clean up closed transports
-                    force_close=consecutive_errors > 3,  # Force close if we've had many errors
-                    keepalive_timeout=30.0 if session_health > 70 else 5.0  # Shorter keepalive for unhealthy sessions
-                )
-                
-                # Calculate appropriate timeout based on network conditions
-                timeout_factor = 1.0 + (consecutive_errors * 0.5)  # Increase timeout after errors
-                total_timeout = REQUEST_TIMEOUT * timeout_factor
-                
-                # Create session with optimized settings
-                current_session = aiohttp.ClientSession(
-                    connector=conn,
-                    timeout=aiohttp.ClientTimeout(
-                        total=total_timeout,
-                        connect=min(30.0, total_timeout / 3),  # Connect timeout
-                        sock_read=min(30.0, total_timeout / 2),  # Socket read timeout
-                        sock_connect=min(30.0, total_timeout / 3)  # Socket connect timeout
-                    ),
-                    # Add client tracing for internal error monitoring
-                    trace_configs=[]
-                )
-                logger.debug(f"Worker {worker_id} created a new session (health: {session_health}, consecutive errors: {consecutive_errors})")
-                return True
-            except Exception as e:
-                retry_count += 1
-                logger.error(f"Worker {worker_id} failed to create session (attempt {retry_count}/{max_retries}): {e}")
-                
-                # Use exponential backoff with jitter
-                backoff_time = get_backoff_time(retry_count)
-                logger.debug(f"Retrying session creation in {backoff_time:.2f}s")
-                await asyncio.sleep(backoff_time)
-        
-        logger.critical(f"Worker {worker_id} failed to create session after {max_retries} attempts")
-        return False
-    
+
+    # aiohttp's connector already handles pooling, DNS caching and
+    # connection recycling, so the worker keeps no per-session health
+    # state: request errors just back off exponentially and the next
+    # attempt goes through the shared pool again
+    consecutive_errors = 0
+
+    # Operation counters for the completion summary
+    operations_total = 0
+    operations_success = 0
+
+    # Pick the session once: a closed session raises RuntimeError from
+    # aiohttp itself, so there is no point re-checking it per URL
+    active_session = session if session is not None and not session.closed else get_shared_session()
+
     try:
-        # Create an operations counter
-        operations_total = 0
-        operations_success = 0
-        last_operation_time = time.time()
-        
-        # Setup monitoring of worker health
-        task_start_time = time.time()
-        
-        # Define adaptive settings for session renewal
-        session_health_check_interval = 10  # Check session health every N requests
-        session_renewal_strategy = "adaptive"  # Can be "fixed", "adaptive", or "error-based"
-        
-        # Create initial session outside the main loop
-        session_created = await create_safe_session()
-        if not session_created:
-            logger.error(f"Worker {worker_id} could not create initial session, exiting")
-            return
-            
-        logger.debug(f"Worker {worker_id} created its own session")
-        
-        # Pending operations tracking for safe cancellation
-        pending_operation = None
-        operation_start_time = None
-        
-        # Task in progress tracking
-        current_url = None
-        current_task_start = None
-        
         while True:
+            # Block until work arrives; the producer enqueues one None
+            # sentinel per worker once every URL for the file is queued,
+            # so idle workers wake exactly once instead of polling
+            item = await request_queue.get()
+            if item is None:
+                request_queue.queue.task_done()
+                logger.info(f"Worker {worker_id} received shutdown sentinel, exiting")
+                break
+
+            # Extract URL, product_ref, filename and SKU from the queue item
+            url = "unknown"
+            product_ref = None
+            filename = "unknown_file"
+            sku = None
+            if isinstance(item, tuple):
+                if len(item) >= 4:
+                    url, product_ref, filename, sku = item
+                elif len(item) >= 3:
+                    url, product_ref, filename = item
+                elif len(item) >= 2:
+                    url, product_ref = item
+                logger.debug("Worker %s processing: URL=%s, product_ref type=%s", worker_id, url, type(product_ref))
+            else:
+                logger.error("Invalid item type in queue: %s", type(item))
+                # Mark as done even if invalid to avoid queue getting stuck
+                try:
+                    request_queue.queue.task_done()
+                except Exception as e:
+                    logger.error(f"Error marking invalid item as done: {e}")
+                continue
+
+            operations_total += 1
+            success = False
+            used_cache = False
             try:
-                # Check worker health and prevent deadlock
-                current_time = time.time()
-                worker_runtime = current_time - task_start_time
-                idle_time = current_time - last_operation_time
-                
-                # Alert if worker appears to be stuck (no operation in 5 minutes)
-                if idle_time > 300 and operations_total > 0:
-                    logger.warning(f"Worker {worker_id} may be stuck. Idle for {idle_time:.2f}s, considering session renewal")
-                    # Force session renewal if worker appears stuck
-                    session_created = await create_safe_session(force_new=True, error_type="worker_stuck")
-                    if session_created:
-                        session_renewal_count = 0
-                        last_operation_time = current_time  # Reset idle timer
-                    else:
-                        logger.error(f"Worker {worker_id} stuck and failed to renew session. Will try to continue.")
-                
-                # Implement adaptive session renewal strategy
-                should_renew_session = False
-                
-                if session_renewal_strategy == "fixed":
-                    # Traditional fixed count renewal
-                    should_renew_session = session_renewal_count >= session_max_renewal
-                elif session_renewal_strategy == "adaptive":
-                    # Adaptive renewal based on:
-                    # 1. Request count
-                    # 2. Session age
-                    # 3. Error rate
-                    session_age = time.time() - task_start_time
-                    error_rate = (operations_total - operations_success) / max(1, operations_total)
-                    
-                    # Calculate renewal threshold based on multiple factors
-                    session_age_threshold = 3600  # 1 hour
-                    session_age = time.time() - task_start_time
-                    
-                    # Consider renewing if:
-                    # 1. Session has been used for several requests
-                    # 2. Session is old
-                    # 3. Error rate is above threshold
-                    should_renew_session = (
-                        session_renewal_count >= session_max_renewal or
-                        session_age > session_age_threshold or
-                        error_rate > 0.2 or  # More than 20% errors
-                        session_health < 60   # Health score below 60%
-                    )
-                elif session_renewal_strategy == "error-based":
-                    # Renew only in response to specific errors
-                    should_renew_session = consecutive_errors > 2
-                
-                # Implement session renewal if needed
-                if should_renew_session:
-                    logger.info(f"Worker {worker_id} renewing session (strategy: {session_renewal_strategy})")
-                    session_created = await create_safe_session(force_new=True)
-                    if session_created:
-                        session_renewal_count = 0
-                        logger.debug(f"Worker {worker_id} renewed session successfully")
-                    else:
-                        logger.error(f"Worker {worker_id} failed to renew session")
-                
-                # Try to get an item from the queue with a short timeout
+                logger.info("Processing URL %s", url)
                 try:
-                    # Use a short timeout to detect empty queues without blocking indefinitely
-                    item = await asyncio.wait_for(request_queue.get(), timeout=5.0)
-                    empty_queue_count = 0  # Reset empty queue counter when we get an item
-                    
-                    # Update operational metrics
-                    operations_total += 1
-                    last_operation_time = time.time()
-                    
-                    # Process the URL - extract URL, product_ref and filename from item
-                    url = "unknown"
-                    product_ref = None
-                    filename = "unknown_file"
-                    
-                    # Extract components from the queue item
-                    if isinstance(item, tuple):
-                        if len(item) >= 3:
-                            url, product_ref, filename = item
-                        elif len(item) >= 2:
-                            url, product_ref = item
-                            filename = "unknown_file"
-                        logger.debug(f"Worker {worker_id} processing: URL={url}, product_ref type={type(product_ref)}")
-                    
-                    # Process the URL
-                    success = False
-                    used_cache = False
+                    # The hard ceiling lives inside process_product_url /
+                    # fetch_url so it covers fetch, parse and save but not
+                    # the rate-limit wait; an expiry surfaces here as
+                    # HardTimeoutError, distinct from transport timeouts
+                    success, used_cache = await process_product_url(active_session, url, product_ref, rate_limiter, sku)
+                except HardTimeoutError:
+                    # Retry once in-line: a requeued item would land
+                    # behind the shutdown sentinels and never be seen
+                    logger.error(f"Worker {worker_id}: processing {url} hit the {PROCESS_URL_HARD_TIMEOUT}s hard ceiling, retrying once")
                     try:
-                        logger.info(f"Processing URL {url}")
-                        try:
-                            # Verify we have a running event loop before proceeding - with more robust checking
-                            have_valid_loop = False
-                            try:
-                                loop = asyncio.get_running_loop()
-                                if not loop.is_closed():
-                                    have_valid_loop = True
-                                else:
-                                    logger.error(f"Worker {worker_id}: Event loop is closed when processing URL {url}")
-                            except RuntimeError:
-                                logger.error(f"Worker {worker_id}: No running event loop when processing URL {url}")
-                            
-                            if not have_valid_loop:
-                                logger.error(f"Cannot process URL {url} without a valid event loop")
-                                # Mark this URL for retry later rather than failing permanently
-                                await asyncio.sleep(1.0)  # Short pause before continuing
-                                # We'll skip this URL and let the queue retry it later
-                                continue
-                                
-                            # Check if session is valid before proceeding
-                            if current_session is None or current_session.closed:
-                                logger.warning(f"Session is closed or None before processing URL {url}, creating new session")
-                                session_created = await create_safe_session(force_new=True, error_type="invalid_session")
-                                if not session_created:
-                                    logger.error(f"Failed to create new session for URL {url}, skipping")
-                                    # Add short backoff before continuing
-                                    await asyncio.sleep(2.0)
-                                    continue
-                                    
-                            # Double-check session validity before processing
-                            if current_session is not None and not current_session.closed:
-                                success, used_cache = await process_product_url(current_session, url, product_ref, semaphore, rate_limiter)
-                                logger.debug(f"Process result: {'Success' if success else 'Failed'} (cached: {used_cache}) for URL {url}")
-                                # Update success metrics
-                                if success:
-                                    operations_success += 1
-                                    # Reset the consecutive error counter on success
-                                    consecutive_errors = 0
-                                # Increment session usage counter for renewal tracking
-                                if not used_cache:
-                                    session_renewal_count += 1
-                            else:
-                                logger.error(f"Could not create a valid session for URL {url}")
-                                success = False
-                                used_cache = False
-                        except aiohttp.ClientConnectionError as e:
-                            logger.error(f"Connection error for URL {url}: {e}")
-                            # Use a more robust event loop check before session renewal
-                            try:
-                                loop = asyncio.get_running_loop()
-                                if not loop.is_closed():
-                                    # Renew session immediately on connection error using the safe helper
-                                    session_created = await create_safe_session(force_new=True, error_type="connection")
-                                    if session_created:
-                                        session_renewal_count = 0
-                                        logger.debug(f"Worker {worker_id} created new session after connection error")
-                                    else:
-                                        logger.error(f"Failed to create new session after connection error for URL {url}")
-                                else:
-                                    logger.error(f"Event loop closed during connection error handling for URL {url}")
-                            except RuntimeError:
-                                logger.error(f"No running event loop during connection error handling for URL {url}")
-                            
-                            # Sleep longer to give system time to recover
-                            await asyncio.sleep(5.0)
-                            continue
-                        except aiohttp.ClientError as e:
-                            logger.error(f"Client error for URL {url}: {e}")
-                            # Check for valid event loop before attempting session renewal
-                            try:
-                                loop = asyncio.get_running_loop()
-                                if not loop.is_closed():
-                                    # For other client errors, we'll also try to renew the session
-                                    session_created = await create_safe_session(force_new=True, error_type="http_error")
-                                    if session_created:
-                                        session_renewal_count = 0
-                                        logger.debug(f"Session renewed after client error")
-                                else:
-                                    logger.error(f"Event loop closed during client error handling for URL {url}")
-                            except RuntimeError:
-                                logger.error(f"No running event loop during client error handling for URL {url}")
-                            
-                            # Add backoff even if session renewal failed
-                            await asyncio.sleep(5.0)
-                            continue
-                        except asyncio.TimeoutError as e:
-                            logger.error(f"Timeout error for URL {url}: {e}")
-                            # Check for valid event loop before attempting session renewal
-                            try:
-                                loop = asyncio.get_running_loop()
-                                if not loop.is_closed():
-                                    # For timeout errors, we'll also try to renew the session with a longer backoff
-                                    session_created = await create_safe_session(force_new=True, error_type="timeout")
-                                    if session_created:
-                                        session_renewal_count = 0
-                                        logger.debug(f"Session renewed after timeout error")
-                                else:
-                                    logger.error(f"Event loop closed during timeout error handling for URL {url}")
-                            except RuntimeError:
-                                logger.error(f"No running event loop during timeout error handling for URL {url}")
-                            
-                            # Add a longer delay for timeout errors
-                            await asyncio.sleep(10.0)
-                            continue
-                        
-                        # Mark as processed in state manager if processing was successful
-                        if success and state_manager is not None:
-                            try:
-                                sku = extract_sku_from_product(product_ref) or extract_sku_from_url(url)
-                                await state_manager.mark_processed(url, sku, filename, used_cache)
-                                logger.debug(f"Successfully processed URL and marked in state manager: {url}")
-                            except Exception as state_error:
-                                logger.error(f"Error updating state manager for URL {url}: {state_error}")
-                        elif not success:
-                            logger.warning(f"Failed to process URL: {url}")
-                    except Exception as e:
-                        logger.error(f"Error in worker {worker_id} processing URL {url}: {e}", exc_info=True)
-                        success = False
-                    finally:
-                        # Mark task as done to ensure queue moves forward
-                        try:
-                            # Verify we have a valid event loop for task completion
-                            have_valid_loop = False
-                            try:
-                                loop = asyncio.get_running_loop()
-                                if not loop.is_closed():
-                                    have_valid_loop = True
-                            except RuntimeError:
-                                logger.error(f"No running event loop when marking task as done for URL {url}")
-                            
-                            if have_valid_loop:
-                                request_queue.task_done(url)
-                                logger.debug(f"Marked URL as complete in queue: {url}")
-                                logger.debug(f"Queue size after task completion: {request_queue.pending_count} items pending")
-                                
-                                # Check remaining queue size
-                                if request_queue.pending_count == 0:
-                                    logger.info(f"Queue is now empty, worker will check a few more times")
-                                else:
-                                    logger.debug(f"Queue still has {request_queue.pending_count} items, continuing")
-                            else:
-                                logger.error(f"Could not mark URL {url} as done due to invalid event loop")
-                        except Exception as e:
-                            logger.error(f"Error marking URL {url} as done in queue: {e}")
-                            # Try to recover from event loop or queue errors by creating a new session
-                            try:
-                                # Check if we have a valid event loop
-                                loop_valid = False
-                                try:
-                                    loop = asyncio.get_running_loop()
-                                    if not loop.is_closed():
-                                        loop_valid = True
-                                except RuntimeError:
-                                    logger.error(f"No running event loop when attempting recovery for URL {url}")
-                                
-                                # Only attempt recovery with a valid event loop
-                                if loop_valid:
-                                    # Force safe session renewal on queue errors
-                                    session_created = await create_safe_session(force_new=True, error_type="queue_error")
-                                    if session_created:
-                                        logger.debug(f"Created new session after queue task completion error")
-                                    else:
-                                        logger.warning(f"Failed to create new session after queue task completion error")
-                            except Exception as session_error:
-                                logger.error(f"Failed to recover from queue task completion error: {session_error}")
-                else:
-                    logger.error(f"Invalid item type in queue: {type(item)}")
-                    # Mark as done even if invalid to avoid queue getting stuck
-                    try:
-                        request_queue.queue.task_done()
-                    except Exception as e:
-                        logger.error(f"Error marking invalid item as done: {e}")
-                        # Try to recover from queue errors
-                        try:
-                            # Force safe session renewal on queue errors
-                            await create_safe_session(force_new=True, error_type="queue_error")
-                        except Exception as session_error:
-                            logger.error(f"Failed to create new session after queue error: {session_error}")
+                        success, used_cache = await process_product_url(active_session, url, product_ref, rate_limiter, sku)
+                    except HardTimeoutError:
+                        logger.error(f"Worker {worker_id}: {url} hit the hard ceiling twice, giving up")
+                logger.debug("Process result: %s (cached: %s) for URL %s", 'Success' if success else 'Failed', used_cache, url)
+                if success:
+                    operations_success += 1
+                    consecutive_errors = 0
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                consecutive_errors += 1
+                backoff = min(2 ** consecutive_errors, 30)
+                logger.error(f"Worker {worker_id} request error for URL {url}: {e}; backing off {backoff}s")
+                if consecutive_errors >= MAX_RETRIES:
+                    # The connector recycles individual sockets on its own;
+                    # only a whole run of failures suggests the pool itself
+                    # has gone bad, so rebuild it once rather than per error
+                    logger.warning(f"Worker {worker_id}: {consecutive_errors} consecutive errors, recycling the shared connection pool")
+                    await close_shared_session()
+                    consecutive_errors = 0
+                # Back off, but wake early if another worker rebuilds the
+                # shared session in the meantime
+                _session_renewed.clear()
+                try:
+                    async with _timeout(backoff):
+                        await _session_renewed.wait()
                 except asyncio.TimeoutError:
-                    # No item in queue within timeout - could be empty
-                    empty_queue_count += 1
-                    logger.debug(f"Worker {worker_id}: Queue empty or timeout ({empty_queue_count}/{max_empty_count})")
-                    
-                    # If we've seen an empty queue multiple times, we're done
-                    if empty_queue_count >= max_empty_count:
-                        logger.info(f"Worker {worker_id} detected consistently empty queue, exiting")
-                        break
-                    
-                    # Short wait before checking again
-                    await asyncio.sleep(1.0)
-                    continue
-            except asyncio.CancelledError:
-                # Task was cancelled, try to complete the current operation if possible
-                logger.info(f"Worker {worker_id} received cancellation signal, cleaning up")
-                raise  # Re-raise to be caught by the outer try
+                    pass
+                if active_session.closed:
+                    active_session = get_shared_session()
             except Exception as e:
-                logger.error(f"Unexpected error in worker {worker_id}: {e}")
-                # Shorter sleep on error
-                await asyncio.sleep(0.5)
-                # Don't increment empty queue counter for errors
+                logger.error(f"Error in worker {worker_id} processing URL {url}: {e}", exc_info=True)
+                if active_session.closed:
+                    active_session = get_shared_session()
+            finally:
+                # Mark task as done to ensure queue moves forward
+                try:
+                    request_queue.task_done(url)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Queue size after task completion: %d items pending", request_queue.pending_count)
+                except Exception as e:
+                    logger.error(f"Error marking URL {url} as done in queue: {e}")
+
+            # Mark as processed in state manager if processing was successful
+            if success and state_manager is not None:
+                try:
+                    if sku is None:
+                        sku = extract_sku_from_product(product_ref) or extract_sku_from_url(url)
+                    state_manager.mark_processed_nowait(url, sku, filename, used_cache)
+                    logger.debug("Successfully processed URL and queued for state manager: %s", url)
+                except Exception as state_error:
+                    logger.error(f"Error updating state manager for URL {url}: {state_error}")
+            elif not success:
+                logger.warning("Failed to process URL: %s", url)
     except asyncio.CancelledError:
-        # Task was cancelled, try to complete the current operation if possible
         logger.info(f"Worker {worker_id} received cancellation signal, cleaning up")
-        try:
-            # Try to mark the current task as done if possible
-            if 'url' in locals() and url != "unknown":
-                request_queue.task_done(url)
-                logger.debug(f"Marked URL as done during cancellation: {url}")
-        except Exception as e:
-            # Log errors during cleanup
-            logger.warning(f"Error marking task done during cancellation: {e}")
-            
-        # If there's a current operation in progress, try to save any partial progress
-        try:
-            if 'url' in locals() and 'product_ref' in locals() and 'filename' in locals() and url != "unknown" and product_ref is not None:
-                # Try to update state manager if we've made any progress
-                if state_manager is not None:
-                    sku = extract_sku_from_product(product_ref) or extract_sku_from_url(url)
-                    if sku:
-                        # Mark as partially processed to avoid losing progress
-                        await state_manager.mark_processed(url, sku, filename, False)
-                        logger.info(f"Saved partial progress for URL {url} during cancellation")
-        except Exception as e:
-            logger.warning(f"Failed to save partial progress during cancellation: {e}")
-            
-        # Try to close the session if we created our own
-        if current_session and not current_session.closed:
-            try:
-                # Ensure we have a running event loop for session.close()
-                try:
-                    asyncio.get_running_loop()
-                    await current_session.close()
-                    logger.debug(f"Worker {worker_id} closed session during cancellation")
-                except RuntimeError:
-                    logger.warning(f"Worker {worker_id}: No running event loop for session closure during cancellation")
-                    # Can't do await, but mark as None so we don't try to use it elsewhere
-                    current_session = None
-            except Exception as e:
-                logger.warning(f"Error closing session during cancellation: {e}")
-                current_session = None
-                
-        logger.info(f"Worker {worker_id} shutting down")
-        return  # Use return instead of break to make it clear we're exiting
-    except Exception as e:
-        logger.error(f"Fatal error in worker {worker_id}: {e}", exc_info=True)
-    
-    # Ensure proper session cleanup in the finally block
+        raise
     finally:
-        # Clean up our own session if we created one
-        if current_session is not None:
-            try:
-                # Check for running event loop before attempting to close
-                try:
-                    loop = asyncio.get_running_loop()
-                    if loop.is_closed():
-                        logger.warning(f"Worker {worker_id}: Event loop is closed during cleanup")
-                        current_session = None
-                    elif not current_session.closed:
-                        await current_session.close()
-                        logger.debug(f"Worker {worker_id} closed its session")
-                except RuntimeError:
-                    logger.warning(f"Worker {worker_id}: No running event loop for final session closure")
-                    # We can't properly close it, but we'll set it to None to prevent reuse
-                    current_session = None
-            except Exception as e:
-                logger.warning(f"Error closing session in worker {worker_id}: {e}")
-                current_session = None
-                
-        # Ensure we report completion even if there were errors
         logger.info(f"Worker {worker_id} has completed. Processed {operations_total} URLs, {operations_success} successful ({((operations_success/max(1, operations_total))*100):.2f}%)")
-                
-        logger.info(f"Worker {worker_id} has completed")
 
 
 async def process_product_url(
     session: aiohttp.ClientSession,
     url: str,
     product_ref: Dict,
-    semaphore: asyncio.Semaphore,
-    rate_limiter: RateLimiter
+    rate_limiter: RateLimiter,
+    sku: Optional[str] = None
 ) -> Tuple[bool, bool]:
     """
     Process a product URL and update the product reference.
-    
+
+    The SKU is resolved once by the producer and carried on the queue
+    tuple; it is only re-derived here for legacy callers that omit it.
+
     Returns:
         Tuple[bool, bool]: (success, used_cache)
             - success: True if processing was successful, False otherwise
             - used_cache: True if cached data was used, False otherwise
     """
     try:
-        # Check if session is valid before proceeding
-        if session is None or session.closed:
-            logger.error(f"Invalid session provided for URL {url}")
-            return False, False
-            
-        async with semaphore:
-            # Wait for rate limiter with a timeout
-            try:
-                await asyncio.wait_for(rate_limiter.acquire(), timeout=30.0)
-            except asyncio.TimeoutError:
-                logger.warning(f"Rate limiter acquisition timed out for {url}, proceeding anyway")
-            
-            # No need for additional delays when checking cache - let the rate limiter handle this
-            
-            # Get SKU from product_ref or from URL first to check for existing data
+        # No rate limiting up here: the slot is reserved inside fetch_url
+        # after the page cache has had its chance, so SKU-cache and
+        # page-cache hits neither consume nor wait on slots
+
+        # Get SKU from product_ref or from URL first to check for existing data
+        if sku is None:
             sku = extract_sku_from_product(product_ref) or extract_sku_from_url(url)
-            if not sku:
-                logger.warning(f"Could not determine SKU for {url}")
-                sku = f"unknown-{int(time.time())}"
+        if not sku:
+            logger.warning("Could not determine SKU for %s", url)
+            sku = f"unknown-{int(time.time())}"
                 
-            # Check if we already have valid data for this SKU
-            existing_data = check_existing_sku_data(sku)
-            if existing_data:
-                logger.info(f"Using existing SKU data for {sku} from file, skipping HTTP request")
+        # Check if we already have valid data for this SKU
+        existing_data = check_existing_sku_data(sku)
+        if existing_data:
+            logger.info("Using existing SKU data for %s from file, skipping HTTP request", sku)
                 
-                # Extract image URLs from existing data
-                image_urls = extract_image_urls(existing_data)
-                if not image_urls:
-                    logger.warning(f"No image URLs found in existing data for SKU {sku}")
-                else:
-                    logger.info(f"Found {len(image_urls)} images in existing data for SKU {sku}")
+            # Extract image URLs from existing data (memoized per SKU)
+            image_urls = _image_urls_for_sku(sku, existing_data)
+            if not image_urls:
+                logger.warning("No image URLs found in existing data for SKU %s", sku)
+            else:
+                logger.info("Found %d images in existing data for SKU %s", len(image_urls), sku)
                     
-                # Update product reference with image URLs
-                try:
-                    product_ref['image'] = image_urls[0] if len(image_urls) == 1 else image_urls
-                    logger.info(f"Updated product with image URL(s): {image_urls[0] if len(image_urls) == 1 else len(image_urls)} images from existing data")
-                    logger.debug(f"Successfully processed {url} using cached data")
-                    # Return (success, used_cache)
-                    return True, True
-                except Exception as e:
-                    logger.error(f"Error updating product reference with image URLs from existing data: {e}")
-                    return False, False
+            # Update product reference with image URLs
+            try:
+                product_ref['image'] = image_urls[0] if len(image_urls) == 1 else image_urls
+                logger.info(f"Updated product with image URL(s): {image_urls[0] if len(image_urls) == 1 else len(image_urls)} images from existing data")
+                logger.debug("Successfully processed %s using cached data", url)
+                # Return (success, used_cache)
+                return True, True
+            except Exception as e:
+                logger.error(f"Error updating product reference with image URLs from existing data: {e}")
+                return False, False
         
         # If no existing data is found, proceed with HTTP request
-        logger.info(f"No existing data found for SKU {sku}, fetching product page: {url}")
-        html = await fetch_url(session, url)
+        logger.info("No existing data found for SKU %s, fetching product page: %s", sku, url)
+        html = await fetch_url(session, url, rate_limiter=rate_limiter)
         
         if not html:
-            logger.error(f"Failed to fetch content for {url}")
-            return False, False
-        
-        # Extract JSON-LD data
-        json_ld_data = extract_json_ld(html, url)
-        if not json_ld_data:
-            logger.warning(f"No JSON-LD data found for {url}")
+            logger.error("Failed to fetch content for %s", url)
             return False, False
         
-        # Save JSON-LD data to file
-        saved = save_json_ld_data(json_ld_data, sku)
+        # The parse/save work runs under the same hard ceiling as the
+        # fetch: a wedged executor thread must not block the worker forever
+        hard_cm = _timeout(PROCESS_URL_HARD_TIMEOUT)
+        try:
+            async with hard_cm:
+                # Extract JSON-LD data and image URLs in one traversal,
+                # off-loop: HTML parsing can take tens of ms on heavy pages
+                # and would stall every other worker if it ran on the event
+                # loop
+                json_ld_data, image_urls = await asyncio.to_thread(extract_json_ld_and_images, html, url)
+                if not json_ld_data:
+                    logger.warning("No JSON-LD data found for %s", url)
+                    return False, False
+
+                # Save JSON-LD data to file off-loop, for the same reason
+                # as the cache writes in fetch_url
+                saved = await asyncio.to_thread(save_json_ld_data, json_ld_data, sku)
+        except asyncio.TimeoutError:
+            if _timeout_expired(hard_cm):
+                raise HardTimeoutError(
+                    f"parsing/saving {url} exceeded the {PROCESS_URL_HARD_TIMEOUT}s hard ceiling"
+                ) from None
+            raise
         if saved:
-            logger.info(f"Successfully saved JSON-LD data for SKU {sku}")
+            logger.info("Successfully saved JSON-LD data for SKU %s", sku)
         else:
-            logger.warning(f"Failed to save JSON-LD data for SKU {sku}")
-        
-        # Extract image URLs
-        image_urls = extract_image_urls(json_ld_data)
+            logger.warning("Failed to save JSON-LD data for SKU %s", sku)
+
         if not image_urls:
-            logger.warning(f"No image URLs found for {url}")
+            logger.warning("No image URLs found for %s", url)
             # Continue anyway since we may have already saved the JSON-LD data
         else:
-            logger.info(f"Found {len(image_urls)} images for {url}")
+            logger.info("Found %d images for %s", len(image_urls), url)
             
             # Update product reference with image URLs
             try:
@@ -1782,6 +2025,10 @@ async def process_product_url(
                 
         # If we got here, processing was successful (without using cache)
         return True, False
+    except (aiohttp.ClientError, asyncio.TimeoutError, HardTimeoutError):
+        # Let transport failures and hard-ceiling expiries reach the
+        # worker instead of flattening them into a generic failure
+        raise
     except Exception as e:
         logger.error(f"Unexpected error processing URL {url}: {e}")
         return False, False
@@ -1790,6 +2037,21 @@ async def process_product_url(
 async def main():
     """Main function to process all JSON files."""
     try:
+        loop = asyncio.get_running_loop()
+
+        # Eager tasks (3.12+) run a fresh task synchronously up to its
+        # first real suspension, so cache-hit URLs that never await a
+        # socket skip a full trip through the scheduler
+        if hasattr(asyncio, 'eager_task_factory'):
+            loop.set_task_factory(asyncio.eager_task_factory)
+
+        # The default executor would spawn min(32, cpu+4) threads; the
+        # off-loop work here (cache and state writes via to_thread) never
+        # needs more than a handful
+        loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='scraper-io'
+        ))
+
         # Find JSON files
         json_files = find_json_files()
         if not json_files:
@@ -1798,9 +2060,6 @@ async def main():
         
         logger.info(f"Found {len(json_files)} JSON files to process")
         
-        # Create a semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-        
         # Create a rate limiter using command line arguments
         # Prioritize command line arguments over defaults
         rate_limit = args.rate_limit
@@ -1817,29 +2076,40 @@ async def main():
         logger.info(f"Using rate limit: {SESSION_RATE_LIMIT} requests per {SESSION_RATE_PERIOD}s")
         rate_limiter = RateLimiter(SESSION_RATE_LIMIT, SESSION_RATE_PERIOD)
         
-        # Create state manager for tracking progress
+        # Create state manager for tracking progress and start its
+        # background flusher; flush on SIGTERM too where supported
         state_manager = StateManager()
-        
-        # Sort files to process converted files first (they're more likely to have good data)
-        # This can help with caching
-        sorted_files = sorted(json_files, key=lambda f: 0 if f.startswith("fd") else 1)
+        state_manager.start_flusher()
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM,
+                lambda: asyncio.create_task(state_manager.save_state())
+            )
+        except NotImplementedError:
+            pass
+
+        # Process converted files first (they're more likely to have good
+        # data, which helps with caching). A two-list partition keeps the
+        # relative order without a Python-level comparator per file
+        fd_files = [f for f in json_files if f.startswith("fd")]
+        sorted_files = fd_files + [f for f in json_files if not f.startswith("fd")]
         
         # Process each JSON file one at a time to avoid overwhelming the server
         for filename in sorted_files:
             # Skip files based on max requests if specified
-            if hasattr(args, 'max_requests') and args.max_requests is not None:
+            if args.max_requests is not None:
                 if len(state_manager.processed_urls) >= args.max_requests:
                     logger.info(f"Reached max requests limit ({args.max_requests}), stopping")
                     break
             
             # Check if file has already been fully processed in resume mode
-            if hasattr(args, 'resume') and args.resume and state_manager.is_file_processed(filename):
+            if RESUME_MODE and state_manager.is_file_processed(filename):
                 logger.info(f"Skipping {filename} - already fully processed (resume mode)")
                 continue
                 
             logger.info(f"Starting to process {filename}")
             try:
-                await process_json_file(filename, semaphore, rate_limiter, state_manager)
+                await process_json_file(filename, rate_limiter, state_manager)
                 logger.info(f"Completed processing {filename}")
             except Exception as e:
                 logger.error(f"Error processing {filename}: {e}")
@@ -1855,9 +2125,12 @@ async def main():
                 logger.info(f"Waiting {delay:.2f}s before processing next file...")
             
             await asyncio.sleep(delay)
-        
+
+        await state_manager.close()
+        await close_shared_session()
+        logger.info(f"SKU lookup cache: {len(_sku_data_cache)} entries")
         logger.info("All JSON files processed successfully")
-    
+
     except Exception as e:
         logger.error(f"Error in main process: {e}")
 
@@ -1881,18 +2154,28 @@ def parse_arguments():
     
     parser.add_argument('--verbose', action='store_true',
                       help='Enable verbose logging')
-    
+
+    parser.add_argument('--export-json', action='store_true',
+                      help='Export the binary state snapshot as JSON and exit')
+
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     # Parse command line arguments
     args = parse_arguments()
-    
+    RESUME_MODE = args.resume
+    VERBOSE_MODE = args.verbose
+
     # Set logging level based on verbose flag
     if args.verbose:
         logger.setLevel(logging.DEBUG)
-    
+
+    # One-shot conversion of the binary snapshot for human inspection
+    if args.export_json:
+        StateManager().export_json()
+        sys.exit(0)
+
     # Check for required dependencies
     try:
         import aiohttp
@@ -1903,8 +2186,8 @@ if __name__ == "__main__":
         logger.info("Please install required packages: pip install aiohttp extruct w3lib")
         sys.exit(1)
     
-    # Set a random seed based on current time
-    random.seed(time.time())
+    # Seed from the OS entropy pool (better than the old wall-clock seed)
+    random.seed()
     
     # Add a small startup delay
     time.sleep(random.uniform(1, 3))
@@ -1922,6 +2205,14 @@ if __name__ == "__main__":
     except Exception as e:
         logger.warning(f"Error counting existing SKU files: {e}")
     
+    # libuv-backed event loop: the same asyncio API with noticeably
+    # cheaper socket readiness handling for aiohttp-heavy workloads
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Run the main function
     asyncio.run(main())
 